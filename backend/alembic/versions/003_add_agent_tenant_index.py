@@ -0,0 +1,40 @@
+"""Add compound tenant index on agents
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-15 12:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = "003"
+down_revision = "002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves the tenant agent listing (leading tenant_id) and every
+    # id + tenant_id lookup from one index. config is left out of the index:
+    # large JSON values would exceed the B-tree tuple size limit.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_agents_tenant_id_id",
+            "agents",
+            ["tenant_id", "id"],
+            postgresql_include=["name", "status", "created_at", "created_by"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_agents_tenant_id_id",
+            table_name="agents",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,39 @@
+"""Add tenant name index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-16 12:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers
+revision = "004"
+down_revision = "003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Registration checks tenant names for duplicates on every sign-up. users
+    # (email) and agents (tenant_id, id) are already indexed. Not unique, so
+    # existing rows with a repeated name do not block the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tenants_name",
+            "tenants",
+            ["name"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tenants_name",
+            table_name="tenants",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""Store agent config as jsonb
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-01-17 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # jsonb is stored parsed: agent updates merge config patches in SQL and
+    # psycopg2 decodes it straight to a dict, neither reparsing json text
+    op.alter_column(
+        "agents",
+        "config",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="config::jsonb",
+    )
+
+
+def downgrade():
+    op.alter_column(
+        "agents",
+        "config",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="config::json",
+    )
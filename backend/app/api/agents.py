@@ -20,6 +20,7 @@ from app.schemas import (
     TaskListResponse,
 )
 from app.services.agent_service import AgentService, TaskService
+from app.services.chat_service import ChatService
 
 router = APIRouter()
 
@@ -35,7 +36,7 @@ async def create_agent(
     """Create a new agent"""
     service = AgentService(db)
     return await service.create_agent_from_schema(
-        agent_data, tenant_id, str(current_user.user_id)
+        agent_data, tenant_id, str(current_user.id)
     )
 
 
@@ -146,9 +147,7 @@ async def create_task(
     """Create a new task"""
     service = TaskService(db)
     try:
-        return await service.create_task(
-            task_data, tenant_id, str(current_user.user_id)
-        )
+        return await service.create_task(task_data, tenant_id, str(current_user.id))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -235,8 +234,6 @@ async def chat_with_agent(
     db: Session = Depends(get_db),
 ):
     """Chat with an agent"""
-    from app.services.chat_service import ChatService
-
     service = ChatService(db)
     return await service.chat_with_agent(
         agent_id=agent_id,
@@ -255,8 +252,6 @@ async def get_chat_history(
     db: Session = Depends(get_db),
 ):
     """Get chat history with an agent"""
-    from app.services.chat_service import ChatService
-
     service = ChatService(db)
     messages = await service.get_chat_history(
         agent_id=agent_id,
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -14,12 +14,23 @@ from app.auth import (
     get_tenant_id,
     require_admin_or_member_role,
 )
+from app.database import OrgSessionLocal
+from app.last_login import LastLoginRecorder
 from app.models.database import User, UserRole
 
 # TODO: Import actual services when they are implemented
 
 router = APIRouter()
 
+# last_login is written in batches off the login path
+last_login_recorder = LastLoginRecorder({"org": OrgSessionLocal})
+
+
+@router.on_event("shutdown")
+async def flush_last_logins():
+    """Write buffered last_login timestamps before the worker exits"""
+    await last_login_recorder.stop()
+
 
 # Pydantic Models
 class LoginRequest(BaseModel):
@@ -77,11 +88,9 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
         data={"sub": user.id}, expires_delta=access_token_expires
     )
 
-    # Update last login
-    from datetime import datetime
-
-    setattr(user, "last_login", datetime.utcnow())
-    db.commit()
+    # Update last login; the row is written by the next batched flush
+    login_time = datetime.utcnow()
+    last_login_recorder.record("org", user.id, login_time)
 
     # TODO: Add security event logging
 
@@ -97,11 +106,7 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
             "role": user.role.value,
             "tenant_id": user.tenant_id,
             "is_active": user.is_active,
-            "last_login": (
-                user.last_login.isoformat()
-                if getattr(user, "last_login", None)
-                else None
-            ),
+            "last_login": login_time.isoformat(),
         },
     )
 
@@ -81,9 +81,10 @@ async def get_security_dashboard(
             detail="Insufficient permissions to view security dashboard",
         )
 
-    # Get recent security events
+    # Get recent security events with the acting user's email in one query
     recent_events = (
-        db.query(SecurityEvent)
+        db.query(SecurityEvent, User.email)
+        .outerjoin(User, User.id == SecurityEvent.user_id)
         .filter(
             SecurityEvent.tenant_id == tenant_id,
             SecurityEvent.created_at >= datetime.utcnow() - timedelta(hours=24),
@@ -129,26 +130,20 @@ async def get_security_dashboard(
     # Calculate security score based on various factors
     security_score = calculate_security_score(tenant_id, db)
 
-    # Format recent events for response
-    formatted_events = []
-    for event in recent_events:
-        user_email = "unknown"
-        if getattr(event, "user_id", None):
-            user = db.query(User).filter(User.id == event.user_id).first()
-            if user:
-                user_email = str(user.email)
-
-        formatted_events.append(
-            {
-                "id": event.id,
-                "type": event.event_type,
-                "user": user_email,
-                "timestamp": event.created_at,
-                "status": event.result or "info",
-                "ip_address": event.ip_address,
-                "risk_score": event.risk_score,
-            }
-        )
+    # Format recent events for response; datetimes are left to the
+    # ORJSONResponse encoder
+    formatted_events = [
+        {
+            "id": event.id,
+            "type": event.event_type,
+            "user": str(user_email) if user_email else "unknown",
+            "timestamp": event.created_at,
+            "status": event.result or "info",
+            "ip_address": event.ip_address,
+            "risk_score": event.risk_score,
+        }
+        for event, user_email in recent_events
+    ]
 
     return SecurityDashboardResponse(
         security_score=security_score,
@@ -4,18 +4,23 @@ Provides JWT token handling, password verification, and role-based access contro
 """
 
 import hashlib
-import secrets
+import hmac
+import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jwt.exceptions import PyJWTError
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.database import get_org_db
 from app.models.database import User, UserRole
+from app.passwords import is_scrypt_hash
+from app.passwords import verify_password as verify_scrypt_password
 
 # Configuration
 SECRET_KEY = "your-secret-key-here-change-in-production"
@@ -26,7 +31,7 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # Password hashing with fallback
 def _simple_hash_password(password: str, salt: Optional[bytes] = None) -> str:
     if salt is None:
-        salt = secrets.token_bytes(32)
+        salt = os.urandom(32)
     pwd_hash = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100000)
     return salt.hex() + ":" + pwd_hash.hex()
 
@@ -38,7 +43,7 @@ def _simple_verify_password(password: str, hash_str: str) -> bool:
         expected_hash = hashlib.pbkdf2_hmac(
             "sha256", password.encode("utf-8"), salt, 100000
         )
-        return expected_hash.hex() == hash_hex
+        return hmac.compare_digest(expected_hash, bytes.fromhex(hash_hex))
     except Exception:
         return False
 
@@ -53,6 +58,9 @@ security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    # Accounts registered through app.main carry scrypt hashes
+    if is_scrypt_hash(hashed_password):
+        return verify_scrypt_password(plain_password, hashed_password)
     if USE_BCRYPT:
         try:
             return pwd_context.verify(plain_password, hashed_password)
@@ -75,23 +83,28 @@ def get_password_hash(password: str) -> str:
         return _simple_hash_password(password)
 
 
+# Checked when an email is unknown, so that login takes as long as it does for a
+# wrong password. Built with get_password_hash so it uses the same scheme
+# (bcrypt, or the PBKDF2 fallback) as the hashes this module writes.
+DUMMY_PASSWORD_HASH = get_password_hash(os.urandom(16).hex())
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    # exp as integer epoch seconds, which is what PyJWT would encode anyway
+    lifetime = expires_delta.total_seconds() if expires_delta else 15 * 60
+    to_encode["exp"] = int(time.time() + lifetime)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = db.query(User).filter(User.email == email).first()
-    if (
-        not user
-        or not verify_password(password, str(user.password_hash))
-        or not bool(user.is_active)
-    ):
+    if not user:
+        verify_password(password, DUMMY_PASSWORD_HASH)
+        return None
+    if not verify_password(password, str(user.password_hash)):
+        return None
+    if not bool(user.is_active):
         return None
     return user
 
@@ -102,7 +115,7 @@ async def get_current_user_from_token(token: str, db: Session) -> Optional[User]
         user_id = payload.get("sub")
         if not user_id:
             return None
-    except JWTError:
+    except PyJWTError:
         return None
 
     user = db.query(User).filter(User.id == user_id).first()
@@ -128,11 +141,13 @@ async def get_current_user(
     return user
 
 
-def get_tenant_id(current_user: User = Depends(get_current_user)) -> str:
+# Pure attribute checks: async so FastAPI awaits them inline instead of
+# dispatching each one to the threadpool
+async def get_tenant_id(current_user: User = Depends(get_current_user)) -> str:
     return str(current_user.tenant_id)
 
 
-def require_admin_or_member_role(
+async def require_admin_or_member_role(
     current_user: User = Depends(get_current_user),
 ) -> User:
     if getattr(current_user, "role", None) == UserRole.GUEST:
@@ -144,8 +159,5 @@ def require_admin_or_member_role(
 
 
 def get_db():
-    db = next(get_org_db())
-    try:
-        yield db
-    finally:
-        db.close()
+    # Delegate so the org dependency's own cleanup closes the session
+    yield from get_org_db()
@@ -0,0 +1,107 @@
+"""
+Active-user cache for the AgentCores API.
+Remembers which database holds an active user so authenticated endpoints can
+skip the user lookup. Shared across workers through Redis.
+"""
+
+import logging
+import time
+from typing import Any, Optional, cast
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+
+    REDIS_AVAILABLE = True
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    aioredis = None  # type: ignore[assignment]
+    RedisError = Exception  # type: ignore[assignment,misc]
+    REDIS_AVAILABLE = False
+
+REDIS_RETRY_SECONDS = 30.0
+# A hung Redis must fail fast so the memory fallback takes over
+REDIS_TIMEOUT_SECONDS = 0.25
+# Users are re-checked against the database this often, so deactivations made
+# anywhere, including directly in the database, take effect within it
+ACTIVE_USER_RECHECK_SECONDS = 60
+MAX_LOCAL_USERS = 100_000
+
+
+class ActiveUserCache:
+    """
+    Maps (tenant_id, user_id) of active users to their database name.
+
+    Current: In-process TTL cache in front of Redis; memory only while Redis is down
+    Entries expire after ttl_seconds; discard() evicts a deactivated user at once
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        redis_url: Optional[str] = None,
+        max_connections: int = 50,
+        max_local_users: int = MAX_LOCAL_USERS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._local: TTLCache = TTLCache(maxsize=max_local_users, ttl=ttl_seconds)
+        self._redis: Any = None
+        self._redis_retry_at = 0.0
+        if redis_url and REDIS_AVAILABLE:
+            self._redis = aioredis.from_url(
+                redis_url,
+                max_connections=max_connections,
+                socket_timeout=REDIS_TIMEOUT_SECONDS,
+                socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+            )
+
+    async def get(self, tenant_id: str, user_id: str) -> Optional[str]:
+        """Database name for an active user, or None when unknown"""
+        key = self._key(tenant_id, user_id)
+        database = cast(Optional[str], self._local.get(key))
+        if database is not None or not self._redis_ready():
+            return database
+        try:
+            value = await self._redis.get(key)
+        except RedisError as e:
+            self._redis_failed(e)
+            return None
+        if value is None:
+            return None
+        database = cast(bytes, value).decode()
+        self._local[key] = database
+        return database
+
+    async def set(self, tenant_id: str, user_id: str, database: str) -> None:
+        """Remember an active user's database until it is due a re-check"""
+        key = self._key(tenant_id, user_id)
+        self._local[key] = database
+        if self._redis_ready():
+            try:
+                await self._redis.set(key, database, ex=self.ttl_seconds)
+            except RedisError as e:
+                self._redis_failed(e)
+
+    async def discard(self, tenant_id: str, user_id: str) -> None:
+        """Forget a user, e.g. after it is deactivated"""
+        key = self._key(tenant_id, user_id)
+        self._local.pop(key, None)
+        if self._redis_ready():
+            try:
+                await self._redis.delete(key)
+            except RedisError as e:
+                self._redis_failed(e)
+
+    @staticmethod
+    def _key(tenant_id: str, user_id: str) -> str:
+        return f"auth:{tenant_id}:{user_id}"
+
+    def _redis_ready(self) -> bool:
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"Active user cache falling back to memory: {str(error)}")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
@@ -3,6 +3,7 @@ Enterprise Database Configuration & Connection Management
 Built for MVP simplicity, designed for billion-dollar platform scale.
 """
 
+import hashlib
 import logging
 import os
 from datetime import datetime
@@ -11,8 +12,7 @@ from typing import Any, Dict, List, Optional, Union
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 from sqlalchemy import create_engine, text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 # Load environment variables
 load_dotenv()
@@ -80,10 +80,16 @@ class EnterpriseConfig:
     CORS_CREDENTIALS: bool = os.getenv("CORS_CREDENTIALS", "true").lower() == "true"
 
     # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = (
+        os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+    )
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = int(
         os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "100")
     )
     RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "200"))
+    # Number of reverse proxies (ALB/Nginx) in front of the API whose
+    # X-Forwarded-For entries can be trusted; 0 ignores the header
+    TRUST_PROXY: int = int(os.getenv("TRUST_PROXY", "0"))
 
     # AI Providers
     OPENROUTER_API_KEY: Optional[str] = os.getenv("OPENROUTER_API_KEY")
@@ -279,8 +285,12 @@ IndividualSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=individual_engine
 )
 
-# Base class for models
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Base class for models"""
+
+    __allow_unmapped__ = True
+
 
 # Password hashing with defensive configuration
 pwd_context: Optional[CryptContext] = None
@@ -346,8 +356,6 @@ def get_password_hash(password: str) -> str:
 
     if pwd_context is None:
         # Ultimate fallback hashing if all schemes fail
-        import hashlib
-
         salt = b"agentcores_fallback_salt_2024"  # Static salt for consistency
         return hashlib.pbkdf2_hmac(
             "sha256", password.encode("utf-8"), salt, 100000
@@ -358,8 +366,6 @@ def get_password_hash(password: str) -> str:
     except Exception as e:
         logger.warning(f"Password hashing failed with {type(e).__name__}: {e}")
         # Fallback to manual hashing
-        import hashlib
-
         salt = b"agentcores_fallback_salt_2024"
         return hashlib.pbkdf2_hmac(
             "sha256", password.encode("utf-8"), salt, 100000
@@ -417,51 +423,47 @@ def get_individual_db() -> Any:
         db.close()
 
 
+def ping_databases() -> Dict[str, bool]:
+    """Run SELECT 1 on each database over a pooled connection"""
+    status = {}
+    for name, engine in (("org", org_engine), ("individual", individual_engine)):
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            status[name] = True
+        except Exception as e:
+            logger.warning(f"Database ping failed for {name}: {e}")
+            status[name] = False
+    return status
+
+
 def init_database() -> None:
     """Initialize multi-database setup with tables and default data"""
-    print("🔧 Initializing enterprise multi-database system...")
-    print("   📊 Organization Database: For multi-tenant organizations")
-    print("   👤 Individual Database: For isolated individual users")
-    print("   🔄 Legacy Database: For compatibility and fallback")
-
     # Validate configuration first
     validation = config.validate_configuration()
     if not validation["valid"]:
-        print("❌ Configuration validation failed:")
-        for issue in validation["issues"]:
-            print(f"   • {issue}")
+        logger.error(
+            f"Configuration validation failed: {'; '.join(validation['issues'])}"
+        )
         raise RuntimeError("Invalid configuration")
 
     if validation["warnings"]:
-        print("⚠️  Configuration warnings:")
-        for warning in validation["warnings"]:
-            print(f"   • {warning}")
+        logger.warning(f"Configuration warnings: {'; '.join(validation['warnings'])}")
 
     # Import models to ensure they're registered with Base
 
-    # Create tables in multi-tenant databases
-    print("🏢 Creating organization database tables...")
+    # Create tables in the organization and individual databases
     Base.metadata.create_all(bind=org_engine, checkfirst=True)
-
-    print("👤 Creating individual users database tables...")
     Base.metadata.create_all(bind=individual_engine, checkfirst=True)
-
-    print("✅ Multi-tenant database tables created")
+    logger.info("Organization and individual database tables ready")
 
     # Create default data in organization database
     db = OrgSessionLocal()
     try:
-        # Check if we already have data
-        existing_tenant_count = db.execute(
-            text("SELECT COUNT(*) FROM tenants")
-        ).scalar()
-        if existing_tenant_count and existing_tenant_count > 0:
-            print("ℹ️  Database already has data, skipping initialization")
-            return
-
-        # Create default tenant
+        # Create default tenant; ON CONFLICT keeps this idempotent and safe
+        # when several workers initialize the database at the same time
         tenant_id = config.DEFAULT_TENANT_ID
-        db.execute(
+        inserted = db.execute(
             text(
                 """
             INSERT INTO tenants (
@@ -474,6 +476,8 @@ def init_database() -> None:
                 :max_agents, :max_tasks_per_hour, :max_monthly_cost,
                 'pay_as_you_go', :now, :now
             )
+            ON CONFLICT DO NOTHING
+            RETURNING tenant_id
         """
             ),
             {
@@ -485,7 +489,12 @@ def init_database() -> None:
                 "max_monthly_cost": config.DEFAULT_MAX_MONTHLY_COST,
                 "now": datetime.utcnow(),
             },
-        )
+        ).first()
+
+        if inserted is None:
+            db.rollback()
+            logger.info("Database already has data, skipping initialization")
+            return
 
         # Create default templates
         templates = [
@@ -523,6 +532,7 @@ def init_database() -> None:
                     :template_id, :name, :description, :industry, :category, :config,
                     :approved_for_production, :created_by, :now, :now
                 )
+                ON CONFLICT (template_id) DO NOTHING
             """
                 ),
                 {**template, "now": datetime.utcnow()},
@@ -530,30 +540,24 @@ def init_database() -> None:
 
         db.commit()
 
-        print("✅ Enterprise initialization complete")
-        print(f"   Default Tenant: {config.DEFAULT_TENANT_NAME}")
-        print(f"   Tenant ID: {tenant_id}")
-        print(f"   Environment: {config.ENVIRONMENT}")
-        print(f"   Features: {list(validation['features_enabled'].keys())}")
-        print("   📋 Default templates created")
+        logger.info(
+            f"Database initialized: tenant={config.DEFAULT_TENANT_NAME} "
+            f"tenant_id={tenant_id} environment={config.ENVIRONMENT} "
+            f"features={list(validation['features_enabled'].keys())} "
+            f"templates={len(templates)}"
+        )
 
     except Exception as e:
-        print(f"❌ Database initialization failed: {e}")
+        logger.error(f"Database initialization failed: {e}")
         db.rollback()
         raise
     finally:
         db.close()
 
 
-# Global configuration instance
-config = EnterpriseConfig()
-
-
 def validate_startup_configuration() -> bool:
     """Validate startup configuration for Docker deployment"""
     try:
-        config = EnterpriseConfig()
-
         # Basic validation
         required_settings = [
             "ORG_DATABASE_URL",
@@ -575,11 +579,12 @@ def validate_startup_configuration() -> bool:
         with individual_engine.connect() as conn:
             conn.execute(text("SELECT 1"))
 
-        print("✅ Startup configuration validated")
-        print(f"   Environment: {config.ENVIRONMENT}")
-        print("   Database: Connected")
+        logger.info(
+            f"Startup configuration validated: environment={config.ENVIRONMENT} "
+            "databases=connected"
+        )
         return True
 
     except Exception as e:
-        print(f"❌ Startup validation failed: {e}")
+        logger.error(f"Startup validation failed: {e}")
         raise
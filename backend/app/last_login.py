@@ -0,0 +1,114 @@
+"""
+Deferred last_login bookkeeping for the AgentCores API.
+Logins record a timestamp in memory; a background task writes them in bulk.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import update
+from starlette.concurrency import run_in_threadpool
+
+from app.models.database import User
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_SECONDS = 60.0
+
+
+class LastLoginRecorder:
+    """
+    Buffers last_login updates per database and flushes them in batches.
+
+    Current: In-process buffer flushed on an interval and at shutdown
+    Future: Buffer shared across workers
+    """
+
+    def __init__(
+        self,
+        session_factories: Dict[str, Callable[[], Any]],
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+    ):
+        self._session_factories = session_factories
+        self.flush_interval = flush_interval
+
+        # database name -> user id -> latest login time
+        self._pending: Dict[str, Dict[Any, datetime]] = {
+            name: {} for name in session_factories
+        }
+        self._flush_task: Optional[asyncio.Task[Any]] = None
+
+    def record(
+        self, database: str, user_id: Any, when: Optional[datetime] = None
+    ) -> None:
+        """Remember a login; repeated logins before a flush collapse to one row"""
+        self._pending[database][user_id] = when or datetime.utcnow()
+        if self._flush_task is None:
+            self._start()
+
+    async def flush(self) -> int:
+        """Write buffered timestamps and return the number of users updated"""
+        written = 0
+        for name in self._pending:
+            # Swap on the event loop so concurrent record() calls land in the
+            # new buffer while the old one is written from a worker thread
+            pending, self._pending[name] = self._pending[name], {}
+            if not pending:
+                continue
+            try:
+                await run_in_threadpool(self._write, name, pending)
+                written += len(pending)
+            except Exception as e:
+                logger.error(f"Failed to flush last_login for {name}: {str(e)}")
+                # Requeue, keeping any newer login recorded meanwhile
+                for user_id, when in pending.items():
+                    self._pending[name].setdefault(user_id, when)
+        return written
+
+    async def stop(self) -> None:
+        """Cancel the background task and write whatever is still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    def _write(self, name: str, pending: Dict[Any, datetime]) -> None:
+        """Bulk UPDATE by primary key in a single transaction"""
+        db = self._session_factories[name]()
+        try:
+            db.execute(
+                update(User),
+                [
+                    {"id": user_id, "last_login": when}
+                    for user_id, when in pending.items()
+                ],
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _start(self) -> None:
+        """Start the periodic flush on the running event loop, if any"""
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+        except RuntimeError:
+            # Called outside an event loop; stop() still flushes the buffer
+            pass
+
+    async def _flush_loop(self) -> None:
+        """Periodically write buffered logins"""
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"last_login flush error: {str(e)}")
@@ -3,33 +3,54 @@ Modern Multi-Tenant FastAPI Application
 Clean architecture without legacy system
 """
 
-import hashlib
-import json
+import asyncio
 import logging
 import os
-import secrets
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Optional
-
-from fastapi import FastAPI, HTTPException, Request
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, TypeVar, cast
+
+import httpx
+import jwt
+import orjson
+from cachetools import LRUCache, TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from jose import jwt
-from jose.exceptions import JWTError
-from passlib.context import CryptContext
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from jwt.exceptions import ExpiredSignatureError, PyJWTError
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import exists, select, text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 # Import multi-tenant database functions
-from app.database import get_individual_db, get_org_db
+from app.auth_cache import ACTIVE_USER_RECHECK_SECONDS, ActiveUserCache
+from app.database import (
+    IndividualSessionLocal,
+    OrgSessionLocal,
+    config,
+    get_individual_db,
+    get_org_db,
+    ping_databases,
+)
+from app.last_login import LastLoginRecorder
 from app.models.database import Tenant, User, UserRole
+from app.passwords import DUMMY_PASSWORD_HASH, get_password_hash, verify_password
+from app.rate_limit import RateLimitMiddleware
 
 # Configuration - Use environment variables for security
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# One PyJWT codec and algorithm list shared by every encode/decode
+_jwt = jwt.PyJWT()
+JWT_ALGORITHMS = [ALGORITHM]
+
+T = TypeVar("T")
 
 # Logging
 logging.basicConfig(level=logging.INFO)
@@ -61,39 +82,87 @@ class LoginResponse(BaseModel):
 
 
 # Helper Functions
-# Simple password hashing functions (inline)
 
+# Password KDFs run on their own pool sized to the CPU count. hashlib releases
+# the GIL, so threads hash in parallel, and a burst of logins cannot take every
+# shared threadpool slot the database calls need.
+_password_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="password"
+)
 
-def get_password_hash(password: str) -> str:
-    """Simple password hashing with salt"""
-    salt = secrets.token_bytes(32)
-    pwd_hash = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100000)
-    return salt.hex() + ":" + pwd_hash.hex()
 
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Simple password verification"""
-    try:
-        salt_hex, hash_hex = hashed_password.split(":")
-        salt = bytes.fromhex(salt_hex)
-        expected_hash = hashlib.pbkdf2_hmac(
-            "sha256", plain_password.encode("utf-8"), salt, 100000
-        )
-        return expected_hash.hex() == hash_hex
-    except Exception:
-        return False
+async def run_password_task(func: Callable[..., T], *args: Any) -> T:
+    """Run a password hash or verify call on the password pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, func, *args)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    # exp as integer epoch seconds, which is what PyJWT would encode anyway
+    lifetime = expires_delta.total_seconds() if expires_delta else 15 * 60
+    to_encode["exp"] = int(time.time() + lifetime)
+    return _jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+# Verified token payloads, so repeat requests skip the signature check and
+# JSON parse. Entries never outlive the token's own exp claim.
+token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def decode_token(token: str) -> dict:
+    """Decode and verify an access token, reusing recent results"""
+    payload: Optional[dict] = token_cache.get(token)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+        del token_cache[token]
+        raise ExpiredSignatureError("Signature has expired")
+
+    payload = _jwt.decode(token, SECRET_KEY, algorithms=JWT_ALGORITHMS)
+    if "exp" in payload:
+        token_cache[token] = payload
+    return payload
+
+
+def email_registered(db, email: str) -> bool:
+    """Check for an existing user with SELECT EXISTS, returning one boolean"""
+    return bool(db.scalar(select(exists().where(User.email == email))))
+
+
+def registration_conflicts(db, email: str, tenant_name: str) -> Tuple[bool, bool]:
+    """(email taken, tenant name taken) from one SELECT of two EXISTS checks"""
+    email_taken, tenant_taken = db.execute(
+        select(
+            exists().where(User.email == email),
+            exists().where(Tenant.name == tenant_name),
+        )
+    ).one()
+    return bool(email_taken), bool(tenant_taken)
+
+
+# Emails seen registered recently. Only hits are cached, so an unknown email
+# always falls through to the database checks.
+registered_emails: TTLCache = TTLCache(maxsize=100_000, ttl=300)
+
+# tenant_id -> "org" or "individual". A tenant lives in exactly one database,
+# learned at register/login or from the first lookup that finds it, so agent
+# endpoints can skip querying the other one.
+tenant_databases: LRUCache = LRUCache(maxsize=100_000)
+
+
+# Timestamp shared by responses within the same second
+_now_iso_cache: list = [-1, ""]
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO format, recomputed at most once per second"""
+    second = int(time.monotonic())
+    if second != _now_iso_cache[0]:
+        _now_iso_cache[0] = second
+        _now_iso_cache[1] = datetime.utcnow().isoformat()
+    return cast(str, _now_iso_cache[1])
 
 
 def get_appropriate_db(is_individual: bool):
@@ -109,6 +178,7 @@ app = FastAPI(
     title="AgentCores Multi-Tenant API",
     description="Modern multi-tenant AI agent platform",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
@@ -120,49 +190,90 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Rate limiting (shared across workers through Redis)
+if config.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        requests_per_minute=config.RATE_LIMIT_REQUESTS_PER_MINUTE,
+        redis_url=config.REDIS_URL,
+        exempt_paths=["/health", "/health/ready"],
+        trusted_proxies=config.TRUST_PROXY,
+    )
+
+# Database of each active user, so authenticated writes skip the user lookup.
+# Entries are short-lived so a deactivated user is rejected within a minute.
+active_users = ActiveUserCache(
+    ttl_seconds=ACTIVE_USER_RECHECK_SECONDS,
+    redis_url=config.REDIS_URL,
+    max_connections=config.REDIS_POOL_SIZE,
+)
+
+# Static probe payloads, built once instead of per request
+ROOT_PAYLOAD = {
+    "message": "AgentCores Multi-Tenant API",
+    "version": "2.0.0",
+    "status": "healthy",
+}
+HEALTH_BODY = orjson.dumps({"status": "healthy"})
+READY_BODY = orjson.dumps({"status": "ready"})
+NOT_READY_BODY = orjson.dumps({"status": "not_ready"})
+
+# API keys are read from the environment once, so the provider list is fixed
+CONFIGURED_PROVIDERS = tuple(
+    name
+    for name, key in (
+        ("openrouter", config.OPENROUTER_API_KEY),
+        ("openai", config.OPENAI_API_KEY),
+        ("anthropic", config.ANTHROPIC_API_KEY),
+    )
+    if key
+)
+DETAILED_HEALTH_STATIC = {"version": "2.0.0", "providers": CONFIGURED_PROVIDERS}
+
 
 @app.get("/")
 async def root():
     """Health check endpoint"""
-    return {
-        "message": "AgentCores Multi-Tenant API",
-        "version": "2.0.0",
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+    return ORJSONResponse({**ROOT_PAYLOAD, "timestamp": _now_iso()})
 
 
 @app.post("/auth/register", response_model=LoginResponse)
-async def register_user(registration: UserRegistrationRequest):
+async def register_user(
+    registration: UserRegistrationRequest,
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
     """Register a new user with tenant creation and return login data"""
-    db = None
+    # Request-scoped sessions only check out a connection on first use
+    if registration.is_individual_account:
+        db, other_db = individual_db, org_db
+    else:
+        db, other_db = org_db, individual_db
     try:
-        # Get appropriate database session
-        db = get_appropriate_db(registration.is_individual_account)
-        # Check both databases for duplicate email
-        ind_db = next(get_individual_db())
-        org_db = next(get_org_db())
-        exists_in_ind = (
-            ind_db.query(User).filter(User.email == registration.email).first()
-        )
-        exists_in_org = (
-            org_db.query(User).filter(User.email == registration.email).first()
-        )
-        ind_db.close()
-        org_db.close()
-        if exists_in_ind or exists_in_org:
-            db.close()
+        # One query per database, both at once on worker threads: the target
+        # database checks email and tenant name together, the other one email
+        if registration.email in registered_emails:
+            email_taken, tenant_taken = True, False
+        else:
+            (email_taken, tenant_taken), email_elsewhere = await asyncio.gather(
+                run_in_threadpool(
+                    registration_conflicts,
+                    db,
+                    registration.email,
+                    registration.tenant_name,
+                ),
+                run_in_threadpool(email_registered, other_db, registration.email),
+            )
+            email_taken = email_taken or email_elsewhere
+        if email_taken:
+            registered_emails[registration.email] = True
             raise HTTPException(
                 status_code=400, detail="Email already registered in the system"
             )
-        # Check if tenant already exists
-        existing_tenant = (
-            db.query(Tenant).filter(Tenant.name == registration.tenant_name).first()
-        )
-        if existing_tenant:
-            db.close()
+        if tenant_taken:
             raise HTTPException(status_code=400, detail="Tenant name already exists")
-        # Create tenant
+        # Create tenant; its id is generated here, so no flush is needed
+        # before the user row and both INSERTs go out together at commit
         tenant_id = str(uuid.uuid4())
         new_tenant = Tenant(
             id=tenant_id,
@@ -171,15 +282,15 @@ async def register_user(registration: UserRegistrationRequest):
             status="active",
             tier="basic",
         )
-        db.add(new_tenant)
-        db.flush()  # Get the tenant ID
         # Create user with proper role assignment and validation
         user_role = (
             UserRole.INDIVIDUAL
             if registration.is_individual_account
             else UserRole.OWNER
         )
-        hashed_password = get_password_hash(registration.password)
+        hashed_password = await run_password_task(
+            get_password_hash, registration.password
+        )
         db_type = "individual" if registration.is_individual_account else "organization"
         logger.info(
             f"Creating {user_role.value} user in {db_type} database for account type: {'individual' if registration.is_individual_account else 'organization'}"
@@ -196,8 +307,12 @@ async def register_user(registration: UserRegistrationRequest):
             is_verified=True,
             last_login=datetime.utcnow(),  # Set initial login time
         )
-        db.add(new_user)
+        db.add_all([new_tenant, new_user])
         db.commit()
+        registered_emails[registration.email] = True
+        database = "individual" if registration.is_individual_account else "org"
+        tenant_databases[tenant_id] = database
+        await active_users.set(tenant_id, str(new_user.id), database)
         logger.info(
             f"User registered successfully: {registration.email} in {'individual' if registration.is_individual_account else 'organization'} database"
         )
@@ -220,210 +335,154 @@ async def register_user(registration: UserRegistrationRequest):
             "tier": new_tenant.tier.value,
         }
 
-        db.close()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Registration failed: {str(e)}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
-        # Create access token for automatic login
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={
-                "sub": str(user_data["id"]),
-                "email": user_data["email"],
-                "tenant_id": str(user_data["tenant_id"]),
-            },
-            expires_delta=access_token_expires,
-        )
+    # Return login data format for seamless frontend integration
+    return _login_response(user_data, tenant_data, database)
+
+
+# Roles allowed to sign in through each login type
+ORG_ROLES = frozenset(
+    {
+        UserRole.OWNER,
+        UserRole.ADMIN,
+        UserRole.MANAGER,
+        UserRole.DEVELOPER,
+        UserRole.ANALYST,
+        UserRole.OPERATOR,
+        UserRole.VIEWER,
+        UserRole.GUEST,
+    }
+)
+INDIVIDUAL_ROLES = frozenset({UserRole.INDIVIDUAL})
 
-        # Return login data format for seamless frontend integration
-        return LoginResponse(
-            access_token=access_token,
-            token_type="bearer",
-            expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            user=user_data,
-            tenant=tenant_data,
+# is_individual_account -> (database name, allowed roles)
+LOGIN_TARGETS = {
+    True: ("individual", INDIVIDUAL_ROLES),
+    False: ("org", ORG_ROLES),
+}
+
+# last_login is written in batches off the login path
+last_login_recorder = LastLoginRecorder(
+    {"org": OrgSessionLocal, "individual": IndividualSessionLocal}
+)
+
+# Same answer for unknown emails, bad passwords and the wrong account type, so
+# login neither reveals which accounts exist nor needs a second database probe
+INVALID_CREDENTIALS = "Incorrect email or password"
+
+
+def _find_login_row(db, email: str):
+    """User and tenant for an email in a single round-trip"""
+    return db.execute(
+        select(User, Tenant)
+        .outerjoin(Tenant, Tenant.id == User.tenant_id)
+        .where(User.email == email)
+        .limit(1)
+    ).first()
+
+
+async def _authenticate(db, login_data: LoginRequest, allowed_roles):
+    """
+    Verify credentials against one database.
+
+    Returns (user_id, user_data, tenant_data) for a valid login.
+    """
+    row = await run_in_threadpool(_find_login_row, db, login_data.email)
+    if row is None:
+        await run_password_task(
+            verify_password, login_data.password, DUMMY_PASSWORD_HASH
         )
+        raise HTTPException(status_code=401, detail=INVALID_CREDENTIALS)
+
+    user, tenant = row
+    if not await run_password_task(
+        verify_password, login_data.password, str(user.password_hash)
+    ):
+        raise HTTPException(status_code=401, detail=INVALID_CREDENTIALS)
+    if user.role not in allowed_roles:
+        raise HTTPException(status_code=401, detail=INVALID_CREDENTIALS)
+    if not bool(user.is_active):
+        raise HTTPException(status_code=401, detail="Account is inactive")
+    if tenant is None:
+        raise HTTPException(status_code=500, detail="Tenant not found")
+
+    user_data = {
+        "id": str(user.id),
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "role": user.role.value,
+        "tenant_id": user.tenant_id,
+        "is_active": user.is_active,
+    }
+    tenant_data = {
+        "id": tenant.id,
+        "name": tenant.name,
+        "status": tenant.status.value,
+        "tier": tenant.tier.value,
+    }
 
-    except Exception as e:
-        logger.error(f"Registration failed: {str(e)}")
-        if db is not None:
-            try:
-                db.rollback()
-                db.close()
-            except Exception:
-                pass
-        raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
-    finally:
-        if db is not None:
-            try:
-                db.close()
-            except Exception:
-                pass
+    return user.id, user_data, tenant_data
+
+
+def _login_response(
+    user_data: dict, tenant_data: dict, database: str
+) -> ORJSONResponse:
+    """
+    Issue an access token for an authenticated user.
+
+    The payload already has the LoginResponse shape, so it is serialized
+    directly instead of being validated again by the response model.
+    """
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={
+            "sub": str(user_data["id"]),
+            "email": user_data["email"],
+            "tenant_id": str(user_data["tenant_id"]),
+            # Home database, so agent endpoints query only that one
+            "acct": database,
+        },
+        expires_delta=access_token_expires,
+    )
+    return ORJSONResponse(
+        {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            "user": user_data,
+            "tenant": tenant_data,
+        }
+    )
 
 
 @app.post("/auth/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest):
+async def login(
+    login_data: LoginRequest,
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
     """Authenticate user from appropriate database"""
+    db = individual_db if login_data.is_individual_account else org_db
+    database, allowed_roles = LOGIN_TARGETS[login_data.is_individual_account]
 
     try:
-        # Organization login logic
-        if not login_data.is_individual_account:
-            org_db = next(get_org_db())
-            user = org_db.query(User).filter(User.email == login_data.email).first()
-            if user:
-                if not bool(user.is_active):
-                    org_db.close()
-                    raise HTTPException(status_code=401, detail="Account is inactive")
-                if not verify_password(login_data.password, str(user.password_hash)):
-                    org_db.close()
-                    raise HTTPException(
-                        status_code=401, detail="Incorrect email or password"
-                    )
-                # Only allow org roles
-                org_roles = [
-                    UserRole.OWNER,
-                    UserRole.ADMIN,
-                    UserRole.MANAGER,
-                    UserRole.DEVELOPER,
-                    UserRole.ANALYST,
-                    UserRole.OPERATOR,
-                    UserRole.VIEWER,
-                    UserRole.GUEST,
-                ]
-                if user.role in org_roles:
-                    tenant = (
-                        org_db.query(Tenant).filter(Tenant.id == user.tenant_id).first()
-                    )
-                    if not tenant:
-                        org_db.close()
-                        raise HTTPException(status_code=500, detail="Tenant not found")
-                    setattr(user, "last_login", datetime.utcnow())
-                    org_db.add(user)
-                    org_db.commit()
-                    user_data = {
-                        "id": str(user.id),
-                        "email": user.email,
-                        "first_name": user.first_name,
-                        "last_name": user.last_name,
-                        "role": user.role.value,
-                        "tenant_id": user.tenant_id,
-                        "is_active": user.is_active,
-                    }
-                    tenant_data = {
-                        "id": tenant.id,
-                        "name": tenant.name,
-                        "status": tenant.status.value,
-                        "tier": tenant.tier.value,
-                    }
-                    org_db.close()
-                    access_token_expires = timedelta(
-                        minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-                    )
-                    access_token = create_access_token(
-                        data={
-                            "sub": str(user_data["id"]),
-                            "email": user_data["email"],
-                            "tenant_id": str(user_data["tenant_id"]),
-                        },
-                        expires_delta=access_token_expires,
-                    )
-                    return LoginResponse(
-                        access_token=access_token,
-                        token_type="bearer",
-                        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                        user=user_data,
-                        tenant=tenant_data,
-                    )
-                else:
-                    org_db.close()
-                    # User is INDIVIDUAL in org DB
-                    raise HTTPException(
-                        status_code=401,
-                        detail="This is an individual account. Please login as individual.",
-                    )
-            # Not found in org DB, check individual DB
-            ind_db = next(get_individual_db())
-            user = ind_db.query(User).filter(User.email == login_data.email).first()
-            if user:
-                ind_db.close()
-                raise HTTPException(
-                    status_code=401,
-                    detail="This is an individual account. Please login as individual.",
-                )
-            ind_db.close()
-            raise HTTPException(status_code=401, detail="Incorrect email or password")
-        # Individual login logic
-        else:
-            ind_db = next(get_individual_db())
-            user = ind_db.query(User).filter(User.email == login_data.email).first()
-            if user:
-                if not bool(user.is_active):
-                    ind_db.close()
-                    raise HTTPException(status_code=401, detail="Account is inactive")
-                if not verify_password(login_data.password, str(user.password_hash)):
-                    ind_db.close()
-                    raise HTTPException(
-                        status_code=401, detail="Incorrect email or password"
-                    )
-                if getattr(user, "role", None) == UserRole.INDIVIDUAL:
-                    tenant = (
-                        ind_db.query(Tenant).filter(Tenant.id == user.tenant_id).first()
-                    )
-                    if not tenant:
-                        ind_db.close()
-                        raise HTTPException(status_code=500, detail="Tenant not found")
-                    setattr(user, "last_login", datetime.utcnow())
-                    ind_db.add(user)
-                    ind_db.commit()
-                    user_data = {
-                        "id": str(user.id),
-                        "email": user.email,
-                        "first_name": user.first_name,
-                        "last_name": user.last_name,
-                        "role": user.role.value,
-                        "tenant_id": user.tenant_id,
-                        "is_active": user.is_active,
-                    }
-                    tenant_data = {
-                        "id": tenant.id,
-                        "name": tenant.name,
-                        "status": tenant.status.value,
-                        "tier": tenant.tier.value,
-                    }
-                    ind_db.close()
-                    access_token_expires = timedelta(
-                        minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-                    )
-                    access_token = create_access_token(
-                        data={
-                            "sub": str(user_data["id"]),
-                            "email": user_data["email"],
-                            "tenant_id": str(user_data["tenant_id"]),
-                        },
-                        expires_delta=access_token_expires,
-                    )
-                    return LoginResponse(
-                        access_token=access_token,
-                        token_type="bearer",
-                        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                        user=user_data,
-                        tenant=tenant_data,
-                    )
-                else:
-                    ind_db.close()
-                    raise HTTPException(
-                        status_code=401,
-                        detail="This is an organization account. Please login as organization.",
-                    )
-            # Not found in individual DB, check org DB
-            org_db = next(get_org_db())
-            user = org_db.query(User).filter(User.email == login_data.email).first()
-            if user:
-                org_db.close()
-                raise HTTPException(
-                    status_code=401,
-                    detail="This is an organization account. Please login as organization.",
-                )
-            org_db.close()
-            raise HTTPException(status_code=401, detail="Incorrect email or password")
+        user_id, user_data, tenant_data = await _authenticate(
+            db, login_data, allowed_roles
+        )
+        last_login_recorder.record(database, user_id)
+        tenant_databases[tenant_data["id"]] = database
+        await active_users.set(tenant_data["id"], user_data["id"], database)
+        return _login_response(user_data, tenant_data, database)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Login failed: {str(e)}")
         raise HTTPException(status_code=401, detail=str(e))
@@ -452,6 +511,10 @@ class AgentCreateRequest(BaseModel):
     rate_limit: int = 60
 
 
+# Every other AgentCreateRequest field is stored in the agent's config column
+AGENT_CONFIG_EXCLUDE = {"name", "description"}
+
+
 class AgentUpdateRequest(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -475,10 +538,38 @@ class AgentUpdateRequest(BaseModel):
     connected_agents: Optional[List[str]] = None
 
 
-# Auth helper
+# Auth helpers
+BEARER_PREFIX = "Bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
+
+
+def get_bearer_token(request: Request) -> str:
+    """Extract the bearer token from the Authorization header or raise 401"""
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith(BEARER_PREFIX):
+        raise HTTPException(
+            status_code=401, detail="Missing or invalid authorization header"
+        )
+    return auth_header[BEARER_PREFIX_LEN:]
+
+
+async def current_payload(request: Request) -> dict:
+    """
+    Verified JWT payload of the request's bearer token.
+
+    FastAPI caches dependency results per request, so endpoints and their
+    sub-dependencies share a single header parse and token check.
+    """
+    token = get_bearer_token(request)
+    try:
+        return decode_token(token)
+    except PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+
 async def get_current_user_from_token(token: str, db):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user_id = payload.get("sub")
         tenant_id = payload.get("tenant_id")
         if not user_id or not tenant_id:
@@ -493,21 +584,101 @@ async def get_current_user_from_token(token: str, db):
         return None
 
 
-@app.post("/agents")
-async def create_agent(agent_data: AgentCreateRequest, request: Request):
-    """Create agent with tenant isolation"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401, detail="Missing or invalid authorization header"
-        )
+def _tenant_sessions(
+    payload: dict, org_db: Session, individual_db: Session
+) -> Tuple[Tuple[str, Session], ...]:
+    """
+    Sessions that can hold the token's tenant data, only its home one when
+    known from the token's acct claim or the routing table.
+    """
+    home = payload.get("acct") or tenant_databases.get(payload.get("tenant_id"))
+    if home == "org":
+        return (("org", org_db),)
+    if home == "individual":
+        return (("individual", individual_db),)
+    return (("org", org_db), ("individual", individual_db))
+
+
+def _fetch_rows(db: Session, statement, params: dict) -> list:
+    return list(db.execute(statement, params).fetchall())
+
+
+async def _fetch_from_each(
+    sessions: Tuple[Tuple[str, Session], ...], statement, params: dict
+) -> list:
+    """Run a read in every session at once; one row list per session"""
+    results: list = await asyncio.gather(
+        *(run_in_threadpool(_fetch_rows, db, statement, params) for _, db in sessions)
+    )
+    return results
+
+
+AGENT_LIST_BATCH_SIZE = 500
+
+# Encoded GET /agents bodies per tenant; agent writes evict their tenant's entry
+agents_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# Larger bodies are streamed without being kept in agents_cache
+AGENT_CACHE_MAX_BYTES = 1024 * 1024
+
+# Agent SQL, built once at import so each request only binds parameters.
+# Raw SQL is used since the model doesn't match the actual schema.
+INSERT_AGENT = text(
+    """
+    INSERT INTO agents (id, tenant_id, name, description, template_id, provider, model, status, config, created_by)
+    VALUES (:id, :tenant_id, :name, :description, :template_id, :provider, :model, :status, :config, :created_by)
+    RETURNING id, name, description, status, config, created_at
+"""
+)
+SELECT_TENANT_AGENTS = text(
+    "SELECT id, name, description, status, config, created_at, created_by FROM agents WHERE tenant_id = :tenant_id"
+).execution_options(stream_results=True, yield_per=AGENT_LIST_BATCH_SIZE)
+SET_AGENT_STATUS = text(
+    "UPDATE agents SET status = :status WHERE id = :agent_id AND tenant_id = :tenant_id"
+)
+DELETE_AGENT = text(
+    "DELETE FROM agents WHERE id = :agent_id AND tenant_id = :tenant_id"
+)
+SELECT_CHAT_AGENT = text(
+    "SELECT id, name, config::text FROM agents WHERE id = :agent_id AND tenant_id = :tenant_id"
+)
+SELECT_CONNECTABLE_AGENTS = text(
+    "SELECT id, name, description, status FROM agents WHERE tenant_id = :tenant_id AND id != :agent_id"
+)
 
-    token = auth_header.split(" ")[1]
 
+def _update_agent_sql(columns: Tuple[str, ...]):
+    """UPDATE setting only the given columns and merging a config patch"""
+    assignments = "".join(f"{column} = :{column}, " for column in columns)
+    return text(
+        f"""
+    UPDATE agents
+    SET {assignments}config = COALESCE(CAST(config AS jsonb), '{{}}'::jsonb)
+        || CAST(:config_patch AS jsonb)
+    WHERE id = :agent_id AND tenant_id = :tenant_id
+    RETURNING id, name, description, status, config
+"""
+    )
+
+
+# One statement per combination of provided top-level columns
+UPDATE_AGENT_COLUMNS = ("name", "description")
+UPDATE_AGENT = {
+    columns: _update_agent_sql(columns)
+    for columns in ((), ("name",), ("description",), ("name", "description"))
+}
+
+
+@app.post("/agents")
+async def create_agent(
+    agent_data: AgentCreateRequest,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
+    """Create agent with tenant isolation"""
     # Determine database based on token payload
-    db = None
+    db: Optional[Session] = None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
         tenant_id = payload.get("tenant_id")
         email = payload.get("email")
@@ -515,51 +686,35 @@ async def create_agent(agent_data: AgentCreateRequest, request: Request):
         if not all([user_id, tenant_id, email]):
             raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        # Determine if individual or org account
-        is_individual = False
-        org_db = next(get_org_db())
-        user = (
-            org_db.query(User)
-            .filter(User.id == user_id, User.tenant_id == tenant_id)
-            .first()
-        )
-        if user:
-            db = org_db
-        else:
-            org_db.close()
-            ind_db = next(get_individual_db())
-            user = (
-                ind_db.query(User)
-                .filter(User.id == user_id, User.tenant_id == tenant_id)
-                .first()
-            )
-            if user:
-                db = ind_db
-                is_individual = True
-            else:
-                ind_db.close()
+        # Determine if individual or org account, from the cache when the
+        # user has already been seen active
+        database = await active_users.get(tenant_id, user_id)
+        if database is None:
+            user = None
+            for database, candidate_db in _tenant_sessions(
+                payload, org_db, individual_db
+            ):
+                user = (
+                    candidate_db.query(User)
+                    .filter(User.id == user_id, User.tenant_id == tenant_id)
+                    .first()
+                )
+                if user:
+                    tenant_databases[tenant_id] = database
+                    break
+            if not user:
                 raise HTTPException(status_code=401, detail="User not found")
-
-        if not bool(user.is_active):
-            db.close()
-            raise HTTPException(status_code=401, detail="User account is inactive")
+            if not bool(user.is_active):
+                raise HTTPException(status_code=401, detail="User account is inactive")
+            await active_users.set(tenant_id, user_id, database)
+        is_individual = database == "individual"
+        db = individual_db if is_individual else org_db
 
         # Create agent with tenant isolation (using actual DB schema)
         agent_id = str(uuid.uuid4())
 
-        # Use raw SQL since the model doesn't match the actual schema
-        from sqlalchemy import text
-
-        insert_query = text(
-            """
-            INSERT INTO agents (id, tenant_id, name, description, template_id, provider, model, status, config, created_by)
-            VALUES (:id, :tenant_id, :name, :description, :template_id, :provider, :model, :status, :config, :created_by)
-            RETURNING id, name, description, status, config, created_at
-        """
-        )
-
         result = db.execute(
-            insert_query,
+            INSERT_AGENT,
             {
                 "id": agent_id,
                 "tenant_id": tenant_id,
@@ -569,432 +724,234 @@ async def create_agent(agent_data: AgentCreateRequest, request: Request):
                 "provider": "openrouter",
                 "model": agent_data.model,
                 "status": "active",
-                "config": json.dumps(
-                    {
-                        "model": agent_data.model,
-                        "instructions": agent_data.instructions,
-                        "temperature": agent_data.temperature,
-                        "max_tokens": agent_data.max_tokens,
-                        "top_p": agent_data.top_p,
-                        "frequency_penalty": agent_data.frequency_penalty,
-                        "presence_penalty": agent_data.presence_penalty,
-                        "agent_type": agent_data.agent_type,
-                        "memory_enabled": agent_data.memory_enabled,
-                        "context_window": agent_data.context_window,
-                        "max_memory_messages": agent_data.max_memory_messages,
-                        "response_style": agent_data.response_style,
-                        "personality": agent_data.personality,
-                        "safety_level": agent_data.safety_level,
-                        "content_filter": agent_data.content_filter,
-                        "response_timeout": agent_data.response_timeout,
-                        "rate_limit": agent_data.rate_limit,
-                    }
-                ),
-                "created_by": user.id,
+                "config": agent_data.model_dump_json(exclude=AGENT_CONFIG_EXCLUDE),
+                "created_by": user_id,
             },
         )
 
         agent_row = result.fetchone()
         if not agent_row:
-            db.close()
             raise HTTPException(
                 status_code=500, detail="Failed to retrieve created agent"
             )
 
         db.commit()
+        agents_cache.pop(tenant_id, None)
 
-        result = {
+        created = {
             "agent_id": str(agent_row[0]),
             "name": agent_row[1],
             "description": agent_row[2],
             "status": agent_row[3],
             "tenant_id": tenant_id,
-            "user_id": str(user.id),
+            "user_id": user_id,
             "config": agent_row[4],
             "created_at": agent_row[5].isoformat(),
             "account_type": "individual" if is_individual else "organization",
         }
 
-        db.close()
         logger.info(
             f"Agent created: {agent_id} for user {user_id} in tenant {tenant_id}"
         )
-        return result
+        return created
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         if db is not None:
             try:
                 db.rollback()
-                db.close()
             except Exception:
                 pass
+        if isinstance(e, HTTPException):
+            raise
         logger.error(f"Agent creation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Agent creation failed: {str(e)}")
 
 
-@app.get("/agents")
-async def get_agents(request: Request):
-    """Get agents with tenant isolation"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(
-            status_code=401, detail="Missing or invalid authorization header"
-        )
+def _agent_list_item(agent, tenant_id: str) -> dict:
+    return {
+        "agent_id": str(agent[0]),
+        "name": agent[1],
+        "description": agent[2],
+        "status": agent[3],
+        "tenant_id": tenant_id,
+        "user_id": str(agent[6]) if agent[6] else None,
+        "config": agent[4],
+        "created_at": agent[5].isoformat() if agent[5] else None,
+    }
 
-    token = auth_header.split(" ")[1]
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        tenant_id = payload.get("tenant_id")
+def _encode_agent_rows(rows, tenant_id: str) -> bytes:
+    return b",".join(orjson.dumps(_agent_list_item(agent, tenant_id)) for agent in rows)
 
-        if not all([user_id, tenant_id]):
-            raise HTTPException(status_code=401, detail="Invalid token payload")
 
-        # Check both databases using raw SQL
-        from sqlalchemy import text
+def _first_agent_batch(db: Session, tenant_id: str) -> Tuple[bytes, int, Any]:
+    """
+    Start reading one database's agents for the tenant from a server-side
+    cursor: the first encoded batch, its row count and the remaining batches
+    """
+    partitions = db.execute(SELECT_TENANT_AGENTS, {"tenant_id": tenant_id}).partitions()
+    rows = next(partitions, [])
+    return _encode_agent_rows(rows, tenant_id), len(rows), partitions
 
-        # Check org database
-        org_db = next(get_org_db())
-        org_query = text(
-            "SELECT id, name, description, status, config, created_at, created_by FROM agents WHERE tenant_id = :tenant_id"
-        )
-        org_result = org_db.execute(org_query, {"tenant_id": tenant_id})
-        org_agents = org_result.fetchall()
-        org_db.close()
 
-        # Check individual database
-        ind_db = next(get_individual_db())
-        ind_result = ind_db.execute(org_query, {"tenant_id": tenant_id})
-        ind_agents = ind_result.fetchall()
-        ind_db.close()
+def _next_agent_batch(partitions, tenant_id: str) -> Optional[Tuple[bytes, int]]:
+    rows = next(partitions, None)
+    if rows is None:
+        return None
+    return _encode_agent_rows(rows, tenant_id), len(rows)
+
+
+async def _stream_agent_list(
+    tenant_id: str, batches: List[Tuple[bytes, int, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Yield the tenant's agents as one JSON document, a batch at a time, so
+    large tenants are never held in memory. Bodies up to AGENT_CACHE_MAX_BYTES
+    are also kept for agents_cache.
+    """
+    head = b'{"tenant_id":' + orjson.dumps(tenant_id) + b',"agents":['
+    cached: Optional[List[bytes]] = [head]
+    cached_size = len(head)
+    yield head
+
+    total = 0
+    for agents, count, partitions in batches:
+        while count:
+            chunk = b"," + agents if total else agents
+            total += count
+            if cached is not None:
+                cached_size += len(chunk)
+                if cached_size > AGENT_CACHE_MAX_BYTES:
+                    cached = None
+                else:
+                    cached.append(chunk)
+            yield chunk
+            try:
+                following = await run_in_threadpool(
+                    _next_agent_batch, partitions, tenant_id
+                )
+            except Exception as e:
+                # Headers are already sent; abort the body rather than end a
+                # short list with a well-formed tail
+                logger.error(f"Get agents failed: {str(e)}")
+                raise
+            if following is None:
+                break
+            agents, count = following
 
-        all_agents = list(org_agents) + list(ind_agents)
+    tail = b'],"total":' + str(total).encode() + b"}"
+    if cached is not None:
+        agents_cache[tenant_id] = b"".join(cached) + tail
+    yield tail
 
-        return {
-            "agents": [
-                {
-                    "agent_id": str(agent[0]),
-                    "name": agent[1],
-                    "description": agent[2],
-                    "status": agent[3],
-                    "tenant_id": tenant_id,
-                    "user_id": str(agent[5]) if agent[5] else None,
-                    "config": agent[4],
-                    "created_at": agent[5].isoformat() if agent[5] else None,
-                }
-                for agent in all_agents
-            ],
-            "total": len(all_agents),
-            "tenant_id": tenant_id,
-        }
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+@app.get("/agents")
+async def get_agents(
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
+    """Get agents with tenant isolation"""
+    user_id = payload.get("sub")
+    tenant_id = payload.get("tenant_id")
+    if not all([user_id, tenant_id]):
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+
+    cached = agents_cache.get(tenant_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Open the databases at once on worker threads so the first byte waits
+    # for the slower one rather than the sum of both; the rest is streamed.
+    # The sessions stay open until the response is sent.
+    try:
+        batches = await asyncio.gather(
+            *(
+                run_in_threadpool(_first_agent_batch, db, tenant_id)
+                for _, db in _tenant_sessions(payload, org_db, individual_db)
+            )
+        )
     except Exception as e:
         logger.error(f"Get agents failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Get agents failed: {str(e)}")
+    return StreamingResponse(
+        _stream_agent_list(tenant_id, list(batches)), media_type="application/json"
+    )
 
 
-@app.post("/agents/{agent_id}/start")
-async def start_agent(agent_id: str, request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing authorization header")
-
-    token = auth_header.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        tenant_id = payload.get("tenant_id")
-        if not tenant_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        from sqlalchemy import text
-
-        update_query = text(
-            "UPDATE agents SET status = 'running' WHERE id = :agent_id AND tenant_id = :tenant_id"
-        )
-
-        org_db = next(get_org_db())
-        result = org_db.execute(
-            update_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-        )
-        if getattr(result, "rowcount", 1) > 0:
-            org_db.commit()
-            org_db.close()
-            return {
-                "message": "Agent started",
-                "agent_id": agent_id,
-                "status": "running",
-            }
-        org_db.close()
-
-        ind_db = next(get_individual_db())
-        result = ind_db.execute(
-            update_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-        )
-        if getattr(result, "rowcount", 1) > 0:
-            ind_db.commit()
-            ind_db.close()
-            return {
-                "message": "Agent started",
-                "agent_id": agent_id,
-                "status": "running",
-            }
-        ind_db.close()
-
-        raise HTTPException(status_code=404, detail="Agent not found")
-    except JWTError:
+def _set_agent_status(
+    agent_id: str, status: str, payload: dict, org_db: Session, individual_db: Session
+) -> None:
+    """Set an agent's status in its tenant's database or raise 404"""
+    tenant_id = payload.get("tenant_id")
+    if not tenant_id:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    params = {"agent_id": agent_id, "tenant_id": tenant_id, "status": status}
+    for database, db in _tenant_sessions(payload, org_db, individual_db):
+        result = db.execute(SET_AGENT_STATUS, params)
+        if getattr(result, "rowcount", 1) > 0:
+            db.commit()
+            agents_cache.pop(tenant_id, None)
+            tenant_databases[tenant_id] = database
+            return
 
-@app.post("/agents/{agent_id}/stop")
-async def stop_agent(agent_id: str, request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing authorization header")
-
-    token = auth_header.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        tenant_id = payload.get("tenant_id")
-        if not tenant_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        from sqlalchemy import text
+    raise HTTPException(status_code=404, detail="Agent not found")
 
-        update_query = text(
-            "UPDATE agents SET status = 'idle' WHERE id = :agent_id AND tenant_id = :tenant_id"
-        )
 
-        org_db = next(get_org_db())
-        result = org_db.execute(
-            update_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-        )
-        try:
-            row_affected = getattr(result, "rowcount", 1) > 0
-        except (AttributeError, TypeError):
-            row_affected = True  # Assume success if rowcount unavailable
-        if row_affected:
-            org_db.commit()
-            org_db.close()
-            return {"message": "Agent stopped", "agent_id": agent_id, "status": "idle"}
-        org_db.close()
+@app.post("/agents/{agent_id}/start")
+async def start_agent(
+    agent_id: str,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
+    _set_agent_status(agent_id, "running", payload, org_db, individual_db)
+    return {"message": "Agent started", "agent_id": agent_id, "status": "running"}
 
-        ind_db = next(get_individual_db())
-        result = ind_db.execute(
-            update_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-        )
-        if getattr(result, "rowcount", 1) > 0:
-            ind_db.commit()
-            ind_db.close()
-            return {"message": "Agent stopped", "agent_id": agent_id, "status": "idle"}
-        ind_db.close()
 
-        raise HTTPException(status_code=404, detail="Agent not found")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+@app.post("/agents/{agent_id}/stop")
+async def stop_agent(
+    agent_id: str,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
+    _set_agent_status(agent_id, "idle", payload, org_db, individual_db)
+    return {"message": "Agent stopped", "agent_id": agent_id, "status": "idle"}
 
 
 @app.put("/agents/{agent_id}")
 async def update_agent(
-    agent_id: str, update_data: AgentUpdateRequest, request: Request
+    agent_id: str,
+    update_data: AgentUpdateRequest,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
 ):
     """Update agent settings"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing authorization header")
-
-    token = auth_header.split(" ")[1]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         tenant_id = payload.get("tenant_id")
         if not tenant_id:
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        from sqlalchemy import text
-
-        # Get current config and merge with updates
-        get_query = text(
-            "SELECT config FROM agents WHERE id = :agent_id AND tenant_id = :tenant_id"
-        )
-        update_query = text(
-            """
-            UPDATE agents
-            SET name = COALESCE(:name, name),
-                description = COALESCE(:description, description),
-                config = :config
-            WHERE id = :agent_id AND tenant_id = :tenant_id
-            RETURNING id, name, description, status, config
-        """
-        )
-
-        # Try org database first
-        org_db = next(get_org_db())
-        result = org_db.execute(
-            get_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-        )
-        current_row = result.fetchone()
-
-        if current_row:
-            # Handle config being either string or dict
-            if current_row[0]:
-                if isinstance(current_row[0], str):
-                    current_config = json.loads(current_row[0])
-                elif isinstance(current_row[0], dict):
-                    current_config = current_row[0]
-                else:
-                    current_config = {}
-            else:
-                current_config = {}
-
-            # Update config with new values
-            if update_data.model:
-                current_config["model"] = update_data.model
-            if update_data.instructions:
-                current_config["instructions"] = update_data.instructions
-            if update_data.temperature is not None:
-                current_config["temperature"] = update_data.temperature
-            if update_data.max_tokens:
-                current_config["max_tokens"] = update_data.max_tokens
-            if update_data.top_p is not None:
-                current_config["top_p"] = update_data.top_p
-            if update_data.frequency_penalty is not None:
-                current_config["frequency_penalty"] = update_data.frequency_penalty
-            if update_data.presence_penalty is not None:
-                current_config["presence_penalty"] = update_data.presence_penalty
-            if update_data.memory_enabled is not None:
-                current_config["memory_enabled"] = update_data.memory_enabled
-            if update_data.context_window:
-                current_config["context_window"] = update_data.context_window
-            if update_data.max_memory_messages:
-                current_config["max_memory_messages"] = update_data.max_memory_messages
-            if update_data.response_style:
-                current_config["response_style"] = update_data.response_style
-            if update_data.personality:
-                current_config["personality"] = update_data.personality
-            if update_data.safety_level:
-                current_config["safety_level"] = update_data.safety_level
-            if update_data.content_filter is not None:
-                current_config["content_filter"] = update_data.content_filter
-            if update_data.response_timeout:
-                current_config["response_timeout"] = update_data.response_timeout
-            if update_data.rate_limit:
-                current_config["rate_limit"] = update_data.rate_limit
-            if update_data.agent_type:
-                current_config["agent_type"] = update_data.agent_type
-            if update_data.connected_agents is not None:
-                current_config["connected_agents"] = update_data.connected_agents
-
-            result = org_db.execute(
-                update_query,
-                {
-                    "agent_id": agent_id,
-                    "tenant_id": tenant_id,
-                    "name": update_data.name,
-                    "description": update_data.description,
-                    "config": json.dumps(current_config),
-                },
-            )
-
-            if getattr(result, "rowcount", 1) > 0:
-                agent_row = result.fetchone()
-                if not agent_row:
-                    org_db.close()
-                    raise HTTPException(
-                        status_code=404, detail="Agent not found after update"
-                    )
-                org_db.commit()
-                org_db.close()
-                return {
-                    "agent_id": str(agent_row[0]),
-                    "name": agent_row[1],
-                    "description": agent_row[2],
-                    "status": agent_row[3],
-                    "config": agent_row[4],
-                    "message": "Agent updated successfully",
-                }
-        org_db.close()
-
-        # Try individual database
-        ind_db = next(get_individual_db())
-        result = ind_db.execute(
-            get_query, {"agent_id": agent_id, "tenant_id": tenant_id}
+        # Only provided fields are written; config keys are merged into the
+        # stored config by the database, so no read-modify-write round trip
+        changes = update_data.model_dump(exclude_none=True)
+        columns = tuple(column for column in UPDATE_AGENT_COLUMNS if column in changes)
+        params = {column: changes.pop(column) for column in columns}
+        params.update(
+            agent_id=agent_id,
+            tenant_id=tenant_id,
+            config_patch=orjson.dumps(changes).decode(),
         )
-        current_row = result.fetchone()
-
-        if current_row:
-            # Handle config being either string or dict
-            if current_row[0]:
-                if isinstance(current_row[0], str):
-                    current_config = json.loads(current_row[0])
-                elif isinstance(current_row[0], dict):
-                    current_config = current_row[0]
-                else:
-                    current_config = {}
-            else:
-                current_config = {}
-
-            # Update config with new values
-            if update_data.model:
-                current_config["model"] = update_data.model
-            if update_data.instructions:
-                current_config["instructions"] = update_data.instructions
-            if update_data.temperature is not None:
-                current_config["temperature"] = update_data.temperature
-            if update_data.max_tokens:
-                current_config["max_tokens"] = update_data.max_tokens
-            if update_data.top_p is not None:
-                current_config["top_p"] = update_data.top_p
-            if update_data.frequency_penalty is not None:
-                current_config["frequency_penalty"] = update_data.frequency_penalty
-            if update_data.presence_penalty is not None:
-                current_config["presence_penalty"] = update_data.presence_penalty
-            if update_data.memory_enabled is not None:
-                current_config["memory_enabled"] = update_data.memory_enabled
-            if update_data.context_window:
-                current_config["context_window"] = update_data.context_window
-            if update_data.max_memory_messages:
-                current_config["max_memory_messages"] = update_data.max_memory_messages
-            if update_data.response_style:
-                current_config["response_style"] = update_data.response_style
-            if update_data.personality:
-                current_config["personality"] = update_data.personality
-            if update_data.safety_level:
-                current_config["safety_level"] = update_data.safety_level
-            if update_data.content_filter is not None:
-                current_config["content_filter"] = update_data.content_filter
-            if update_data.response_timeout:
-                current_config["response_timeout"] = update_data.response_timeout
-            if update_data.rate_limit:
-                current_config["rate_limit"] = update_data.rate_limit
-            if update_data.agent_type:
-                current_config["agent_type"] = update_data.agent_type
-            if update_data.connected_agents is not None:
-                current_config["connected_agents"] = update_data.connected_agents
-
-            result = ind_db.execute(
-                update_query,
-                {
-                    "agent_id": agent_id,
-                    "tenant_id": tenant_id,
-                    "name": update_data.name,
-                    "description": update_data.description,
-                    "config": json.dumps(current_config),
-                },
-            )
 
-            if getattr(result, "rowcount", 1) > 0:
-                agent_row = result.fetchone()
-                if not agent_row:
-                    ind_db.close()
-                    raise HTTPException(
-                        status_code=404, detail="Agent not found after update"
-                    )
-                ind_db.commit()
-                ind_db.close()
+        for database, db in _tenant_sessions(payload, org_db, individual_db):
+            agent_row = db.execute(UPDATE_AGENT[columns], params).fetchone()
+            if agent_row:
+                db.commit()
+                agents_cache.pop(tenant_id, None)
+                tenant_databases[tenant_id] = database
                 return {
                     "agent_id": str(agent_row[0]),
                     "name": agent_row[1],
@@ -1003,59 +960,165 @@ async def update_agent(
                     "config": agent_row[4],
                     "message": "Agent updated successfully",
                 }
-        ind_db.close()
 
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Agent update failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Agent update failed: {str(e)}")
 
 
 @app.delete("/agents/{agent_id}")
-async def delete_agent(agent_id: str, request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing authorization header")
+async def delete_agent(
+    agent_id: str,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
+    tenant_id = payload.get("tenant_id")
+    if not tenant_id:
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-    token = auth_header.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        tenant_id = payload.get("tenant_id")
-        if not tenant_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    for database, db in _tenant_sessions(payload, org_db, individual_db):
+        result = db.execute(
+            DELETE_AGENT, {"agent_id": agent_id, "tenant_id": tenant_id}
+        )
+        if getattr(result, "rowcount", 1) > 0:
+            db.commit()
+            agents_cache.pop(tenant_id, None)
+            tenant_databases[tenant_id] = database
+            return {"message": "Agent deleted", "agent_id": agent_id}
 
-        from sqlalchemy import text
+    raise HTTPException(status_code=404, detail="Agent not found")
 
-        delete_query = text(
-            "DELETE FROM agents WHERE id = :agent_id AND tenant_id = :tenant_id"
-        )
 
-        org_db = next(get_org_db())
-        result = org_db.execute(
-            delete_query, {"agent_id": agent_id, "tenant_id": tenant_id}
+# Connection pool of app.state.chat_http, the client shared by every chat
+# request so OpenRouter connections and TLS sessions are reused per message
+CHAT_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+
+# Chat settings per stored config text. Equal text means equal settings, so
+# an edited agent misses on its new text instead of needing an eviction.
+chat_settings_cache: LRUCache = LRUCache(maxsize=10_000)
+
+
+def build_system_prompt(agent_config: dict) -> str:
+    """Agent instructions plus its safety, filtering, personality and style rules"""
+    instructions = agent_config.get("instructions", "You are a helpful AI assistant.")
+
+    # Apply personality and response style to instructions
+    personality = agent_config.get("personality", "professional")
+    response_style = agent_config.get("response_style", "balanced")
+    safety_level = agent_config.get("safety_level", "standard")
+    blocked_topics = agent_config.get("blocked_topics", "")
+    content_filter = agent_config.get("content_filter", True)
+
+    # Enhanced instructions based on settings with security controls
+    enhanced_instructions: str = instructions
+
+    # Security controls - always apply regardless of settings
+    enhanced_instructions += " SECURITY: Never provide harmful, illegal, or dangerous content. Do not assist with illegal activities, violence, or harmful actions."
+
+    # Apply safety level controls
+    if safety_level == "strict":
+        enhanced_instructions += " STRICT MODE: Be extremely cautious about any potentially sensitive content. Refuse requests that could be harmful in any way."
+    elif safety_level == "permissive":
+        enhanced_instructions += " PERMISSIVE MODE: You can discuss sensitive topics but still maintain ethical boundaries."
+
+    # Apply content filtering
+    if content_filter:
+        enhanced_instructions += " Apply content filtering to avoid inappropriate, offensive, or harmful content."
+
+    # Apply blocked topics
+    if blocked_topics:
+        topics_list = [
+            topic.strip() for topic in blocked_topics.split(",") if topic.strip()
+        ]
+        if topics_list:
+            enhanced_instructions += f" BLOCKED TOPICS: Refuse to discuss or provide information about: {', '.join(topics_list)}."
+
+    # Apply personality
+    if personality != "professional":
+        enhanced_instructions += (
+            f" Adopt a {personality} personality in your responses."
         )
-        if getattr(result, "rowcount", 1) > 0:
-            org_db.commit()
-            org_db.close()
-            return {"message": "Agent deleted", "agent_id": agent_id}
-        org_db.close()
 
-        ind_db = next(get_individual_db())
-        result = ind_db.execute(
-            delete_query, {"agent_id": agent_id, "tenant_id": tenant_id}
+    # Apply response style
+    if response_style == "concise":
+        enhanced_instructions += " Keep responses brief and to the point."
+    elif response_style == "detailed":
+        enhanced_instructions += " Provide detailed, comprehensive responses."
+    elif response_style == "step_by_step":
+        enhanced_instructions += (
+            " Break down complex topics into step-by-step explanations."
         )
-        if getattr(result, "rowcount", 1) > 0:
-            ind_db.commit()
-            ind_db.close()
-            return {"message": "Agent deleted", "agent_id": agent_id}
-        ind_db.close()
 
-        raise HTTPException(status_code=404, detail="Agent not found")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    return enhanced_instructions
+
+
+OPENROUTER_PREFIX_LEN = len("openrouter/")
+
+# Legacy model ids mapped to verified working free models on OpenRouter
+MODEL_MAPPINGS = MappingProxyType(
+    {
+        # Legacy Meta Llama models -> Newer versions
+        "openrouter/meta-llama/llama-3.2-3b-instruct:free": "openrouter/meta-llama/llama-3.3-8b-instruct:free",
+        "openrouter/meta-llama/llama-3.2-1b-instruct:free": "openrouter/meta-llama/llama-3.3-8b-instruct:free",
+        "openrouter/meta-llama/llama-3.1-8b-instruct:free": "openrouter/meta-llama/llama-3.3-8b-instruct:free",
+        "openrouter/meta-llama/llama-3.1-70b-instruct:free": "openrouter/meta-llama/llama-3.3-70b-instruct:free",
+        "openrouter/meta-llama/llama-3.1-405b-instruct:free": "openrouter/meta-llama/llama-4-maverick:free",
+        # Legacy Mistral models -> Working versions
+        "openrouter/mistralai/mistral-7b-instruct:free": "openrouter/mistralai/mistral-nemo:free",
+        # Legacy Google models -> Working Gemma models
+        "openrouter/google/gemma-7b-it:free": "openrouter/google/gemma-3-12b-it:free",
+        "openrouter/google/gemma-2-9b-it:free": "openrouter/google/gemma-3-12b-it:free",
+        "openrouter/google/gemini-2.0-flash-exp:free": "openrouter/google/gemma-3-27b-it:free",
+        # Other legacy models -> NVIDIA Nemotron
+        "openrouter/microsoft/phi-3-mini-128k-instruct:free": "openrouter/nvidia/nemotron-nano-9b-v2:free",
+        "openrouter/openai/gpt-oss-20b:free": "openrouter/nvidia/nemotron-nano-9b-v2:free",
+        # Non-functional models -> Working alternatives
+        "openrouter/x-ai/grok-4-fast:free": "openrouter/deepseek/deepseek-chat-v3.1:free",
+        "openrouter/qwen/qwen3-coder:free": "openrouter/qwen/qwen-2.5-72b-instruct:free",
+        "openrouter/deepseek/deepseek-r1:free": "openrouter/deepseek/deepseek-chat-v3.1:free",
+    }
+)
+
+
+def resolve_model(model: str) -> str:
+    """OpenRouter API model name for an agent's configured model"""
+    # Ensure we have openrouter/ prefix for consistency
+    if not model.startswith("openrouter/"):
+        model = f"openrouter/{model}"
+    model = MODEL_MAPPINGS.get(model, model)
+    # Remove openrouter/ prefix for API call (OpenRouter expects just the model name)
+    return model[OPENROUTER_PREFIX_LEN:]
+
+
+def _chat_settings(config_text: str) -> dict:
+    """API model, clamped sampling parameters and system prompt for chat"""
+    settings: Optional[dict] = chat_settings_cache.get(config_text)
+    if settings is not None:
+        return settings
+
+    agent_config = orjson.loads(config_text)
+    settings = {
+        "api_model": resolve_model(
+            agent_config.get("model", "openrouter/deepseek/deepseek-chat-v3.1:free")
+        ),
+        "temperature": max(0.0, min(2.0, float(agent_config.get("temperature", 0.7)))),
+        "max_tokens": max(1, min(8000, int(agent_config.get("max_tokens", 1000)))),
+        "top_p": max(0.0, min(1.0, float(agent_config.get("top_p", 1.0)))),
+        "frequency_penalty": max(
+            -2.0, min(2.0, float(agent_config.get("frequency_penalty", 0.0)))
+        ),
+        "presence_penalty": max(
+            -2.0, min(2.0, float(agent_config.get("presence_penalty", 0.0)))
+        ),
+        "system_prompt": build_system_prompt(agent_config),
+    }
+    chat_settings_cache[config_text] = settings
+    return settings
 
 
 # Chat endpoints
@@ -1065,151 +1128,46 @@ class ChatRequest(BaseModel):
 
 
 @app.post("/agents/{agent_id}/chat")
-async def chat_with_agent(agent_id: str, chat_request: ChatRequest, request: Request):
+async def chat_with_agent(
+    agent_id: str,
+    chat_request: ChatRequest,
+    request: Request,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
     """Chat with an agent"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing authorization header")
-
-    token = auth_header.split(" ")[1]
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
         tenant_id = payload.get("tenant_id")
         if not all([user_id, tenant_id]):
             raise HTTPException(status_code=401, detail="Invalid token")
 
-        # Get agent from database
-        from sqlalchemy import text
-
-        agent_query = text(
-            "SELECT id, name, config FROM agents WHERE id = :agent_id AND tenant_id = :tenant_id"
+        # Get agent from database; both are queried at once when the tenant's
+        # home database is not known
+        sessions = _tenant_sessions(payload, org_db, individual_db)
+        results = await _fetch_from_each(
+            sessions, SELECT_CHAT_AGENT, {"agent_id": agent_id, "tenant_id": tenant_id}
         )
-
         agent = None
-        org_db = next(get_org_db())
-        result = org_db.execute(
-            agent_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-        )
-        agent_row = result.fetchone()
-        if agent_row:
-            agent = agent_row
+        for (database, _), rows in zip(sessions, results):
+            if rows:
+                agent = rows[0]
+                tenant_databases[tenant_id] = database
+                break
+        # Hand the connections back to the pool before the slow provider call;
+        # the dependency's own close afterwards is a no-op
         org_db.close()
-
-        if not agent:
-            ind_db = next(get_individual_db())
-            result = ind_db.execute(
-                agent_query, {"agent_id": agent_id, "tenant_id": tenant_id}
-            )
-            agent_row = result.fetchone()
-            if agent_row:
-                agent = agent_row
-            ind_db.close()
+        individual_db.close()
 
         if not agent:
             raise HTTPException(status_code=404, detail="Agent not found")
 
         # Get agent response using OpenRouter
-        import os
-
-        import httpx
-
-        config = json.loads(agent[2]) if isinstance(agent[2], str) else agent[2]
-        model = config.get("model", "openrouter/deepseek/deepseek-chat-v3.1:free")
-
-        # Ensure we have openrouter/ prefix for consistency
-        if not model.startswith("openrouter/"):
-            model = f"openrouter/{model}"
-
-        # Map legacy models to verified working free models on OpenRouter
-        model_mappings = {
-            # Legacy Meta Llama models -> Newer versions
-            "openrouter/meta-llama/llama-3.2-3b-instruct:free": "openrouter/meta-llama/llama-3.3-8b-instruct:free",
-            "openrouter/meta-llama/llama-3.2-1b-instruct:free": "openrouter/meta-llama/llama-3.3-8b-instruct:free",
-            "openrouter/meta-llama/llama-3.1-8b-instruct:free": "openrouter/meta-llama/llama-3.3-8b-instruct:free",
-            "openrouter/meta-llama/llama-3.1-70b-instruct:free": "openrouter/meta-llama/llama-3.3-70b-instruct:free",
-            "openrouter/meta-llama/llama-3.1-405b-instruct:free": "openrouter/meta-llama/llama-4-maverick:free",
-            # Legacy Mistral models -> Working versions
-            "openrouter/mistralai/mistral-7b-instruct:free": "openrouter/mistralai/mistral-nemo:free",
-            # Legacy Google models -> Working Gemma models
-            "openrouter/google/gemma-7b-it:free": "openrouter/google/gemma-3-12b-it:free",
-            "openrouter/google/gemma-2-9b-it:free": "openrouter/google/gemma-3-12b-it:free",
-            "openrouter/google/gemini-2.0-flash-exp:free": "openrouter/google/gemma-3-27b-it:free",
-            # Other legacy models -> NVIDIA Nemotron
-            "openrouter/microsoft/phi-3-mini-128k-instruct:free": "openrouter/nvidia/nemotron-nano-9b-v2:free",
-            "openrouter/openai/gpt-oss-20b:free": "openrouter/nvidia/nemotron-nano-9b-v2:free",
-            # Non-functional models -> Working alternatives
-            "openrouter/x-ai/grok-4-fast:free": "openrouter/deepseek/deepseek-chat-v3.1:free",
-            "openrouter/qwen/qwen3-coder:free": "openrouter/qwen/qwen-2.5-72b-instruct:free",
-            "openrouter/deepseek/deepseek-r1:free": "openrouter/deepseek/deepseek-chat-v3.1:free",
-        }
-
-        if model in model_mappings:
-            model = model_mappings[model]
-
-        # Remove openrouter/ prefix for API call (OpenRouter expects just the model name)
-        api_model = model[11:] if model.startswith("openrouter/") else model
-
-        instructions = config.get("instructions", "You are a helpful AI assistant.")
-        temperature = max(0.0, min(2.0, float(config.get("temperature", 0.7))))
-        max_tokens = max(1, min(8000, int(config.get("max_tokens", 1000))))
-        top_p = max(0.0, min(1.0, float(config.get("top_p", 1.0))))
-        frequency_penalty = max(
-            -2.0, min(2.0, float(config.get("frequency_penalty", 0.0)))
-        )
-        presence_penalty = max(
-            -2.0, min(2.0, float(config.get("presence_penalty", 0.0)))
-        )
-
-        # Apply personality and response style to instructions
-        personality = config.get("personality", "professional")
-        response_style = config.get("response_style", "balanced")
-        safety_level = config.get("safety_level", "standard")
-        blocked_topics = config.get("blocked_topics", "")
-        content_filter = config.get("content_filter", True)
-
-        # Enhanced instructions based on settings with security controls
-        enhanced_instructions = instructions
-
-        # Security controls - always apply regardless of settings
-        enhanced_instructions += " SECURITY: Never provide harmful, illegal, or dangerous content. Do not assist with illegal activities, violence, or harmful actions."
-
-        # Apply safety level controls
-        if safety_level == "strict":
-            enhanced_instructions += " STRICT MODE: Be extremely cautious about any potentially sensitive content. Refuse requests that could be harmful in any way."
-        elif safety_level == "permissive":
-            enhanced_instructions += " PERMISSIVE MODE: You can discuss sensitive topics but still maintain ethical boundaries."
-
-        # Apply content filtering
-        if content_filter:
-            enhanced_instructions += " Apply content filtering to avoid inappropriate, offensive, or harmful content."
-
-        # Apply blocked topics
-        if blocked_topics:
-            topics_list = [
-                topic.strip() for topic in blocked_topics.split(",") if topic.strip()
-            ]
-            if topics_list:
-                enhanced_instructions += f" BLOCKED TOPICS: Refuse to discuss or provide information about: {', '.join(topics_list)}."
-
-        # Apply personality
-        if personality != "professional":
-            enhanced_instructions += (
-                f" Adopt a {personality} personality in your responses."
-            )
-
-        # Apply response style
-        if response_style == "concise":
-            enhanced_instructions += " Keep responses brief and to the point."
-        elif response_style == "detailed":
-            enhanced_instructions += " Provide detailed, comprehensive responses."
-        elif response_style == "step_by_step":
-            enhanced_instructions += (
-                " Break down complex topics into step-by-step explanations."
-            )
+        settings = _chat_settings(agent[2])
 
         # Check if API key is properly configured
-        api_key = os.getenv("OPENROUTER_API_KEY")
+        api_key = config.OPENROUTER_API_KEY
         if not api_key or api_key == "sk-or-v1-your-key-here":
             return {
                 "message": {
@@ -1236,41 +1194,40 @@ async def chat_with_agent(agent_id: str, chat_request: ChatRequest, request: Req
         }
 
         # Build messages with enhanced instructions
-        messages = [{"role": "system", "content": enhanced_instructions}]
+        messages = [{"role": "system", "content": settings["system_prompt"]}]
         messages.append({"role": "user", "content": chat_request.message})
 
-        payload = {
-            "model": api_model,
+        request_body = {
+            "model": settings["api_model"],
             "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-            "top_p": top_p,
-            "frequency_penalty": frequency_penalty,
-            "presence_penalty": presence_penalty,
+            "temperature": settings["temperature"],
+            "max_tokens": settings["max_tokens"],
+            "top_p": settings["top_p"],
+            "frequency_penalty": settings["frequency_penalty"],
+            "presence_penalty": settings["presence_penalty"],
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=payload,
-            )
+        response = await request.app.state.chat_http.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers=headers,
+            content=orjson.dumps(request_body),
+        )
 
-            if response.status_code != 200:
-                try:
-                    error_detail = response.json()
-                    logger.error(
-                        f"OpenRouter API Error {response.status_code}: {error_detail}"
-                    )
-                    agent_response = f"I apologize, but I encountered an error: {response.status_code}. Please check the API configuration."
-                except Exception:
-                    logger.error(
-                        f"OpenRouter API Error {response.status_code}: {response.text}"
-                    )
-                    agent_response = f"I apologize, but I encountered an error: {response.status_code}. Please check the API configuration."
-            else:
-                result = response.json()
-                agent_response = result["choices"][0]["message"]["content"]
+        if response.status_code != 200:
+            try:
+                error_detail = orjson.loads(response.content)
+                logger.error(
+                    f"OpenRouter API Error {response.status_code}: {error_detail}"
+                )
+                agent_response = f"I apologize, but I encountered an error: {response.status_code}. Please check the API configuration."
+            except Exception:
+                logger.error(
+                    f"OpenRouter API Error {response.status_code}: {response.text}"
+                )
+                agent_response = f"I apologize, but I encountered an error: {response.status_code}. Please check the API configuration."
+        else:
+            result = orjson.loads(response.content)
+            agent_response = result["choices"][0]["message"]["content"]
 
         return {
             "message": {
@@ -1289,8 +1246,6 @@ async def chat_with_agent(agent_id: str, chat_request: ChatRequest, request: Req
             },
         }
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         logger.error("Chat failed: %s", str(e))
         return {
@@ -1318,61 +1273,132 @@ async def get_chat_history(agent_id: str, request: Request):
 
 
 @app.get("/agents/available/{agent_id}")
-async def get_available_agents_for_connection(agent_id: str, request: Request):
+async def get_available_agents_for_connection(
+    agent_id: str,
+    payload: dict = Depends(current_payload),
+    org_db: Session = Depends(get_org_db),
+    individual_db: Session = Depends(get_individual_db),
+):
     """Get available agents for connection"""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing authorization header")
+    tenant_id = payload.get("tenant_id")
+    if not tenant_id:
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-    token = auth_header.split(" ")[1]
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        tenant_id = payload.get("tenant_id")
-        if not tenant_id:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    results = await _fetch_from_each(
+        _tenant_sessions(payload, org_db, individual_db),
+        SELECT_CONNECTABLE_AGENTS,
+        {"tenant_id": tenant_id, "agent_id": agent_id},
+    )
+    all_agents = [agent for rows in results for agent in rows]
 
-        from sqlalchemy import text
+    return {
+        "agents": [
+            {
+                "id": str(agent[0]),
+                "name": agent[1],
+                "description": agent[2],
+                "status": agent[3],
+            }
+            for agent in all_agents
+        ]
+    }
 
-        query = text(
-            "SELECT id, name, description, status FROM agents WHERE tenant_id = :tenant_id AND id != :agent_id"
-        )
 
-        # Check org database
-        org_db = next(get_org_db())
-        result = org_db.execute(query, {"tenant_id": tenant_id, "agent_id": agent_id})
-        org_agents = result.fetchall()
-        org_db.close()
+def _load_tenant_databases() -> int:
+    """Fill tenant_databases from the tenants table of each database"""
+    loaded = 0
+    for database, session_factory in (
+        ("org", OrgSessionLocal),
+        ("individual", IndividualSessionLocal),
+    ):
+        db = session_factory()
+        try:
+            tenant_ids = db.execute(
+                select(Tenant.id).execution_options(
+                    stream_results=True, yield_per=AGENT_LIST_BATCH_SIZE
+                )
+            ).scalars()
+            for tenant_id in tenant_ids:
+                tenant_databases[tenant_id] = database
+                loaded += 1
+        except Exception as e:
+            logger.warning(f"Tenant routing backfill failed for {database}: {str(e)}")
+        finally:
+            db.close()
+    return loaded
 
-        # Check individual database
-        ind_db = next(get_individual_db())
-        result = ind_db.execute(query, {"tenant_id": tenant_id, "agent_id": agent_id})
-        ind_agents = result.fetchall()
-        ind_db.close()
 
-        all_agents = list(org_agents) + list(ind_agents)
+_tenant_backfill: Optional[asyncio.Task[int]] = None
 
-        return {
-            "agents": [
-                {
-                    "id": str(agent[0]),
-                    "name": agent[1],
-                    "description": agent[2],
-                    "status": agent[3],
-                }
-                for agent in all_agents
-            ]
-        }
 
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+@app.on_event("startup")
+async def backfill_tenant_databases():
+    """Load the tenant routing table in the background without delaying startup"""
+    global _tenant_backfill
+    _tenant_backfill = asyncio.get_running_loop().create_task(
+        run_in_threadpool(_load_tenant_databases)
+    )
+
+
+@app.on_event("shutdown")
+async def flush_last_logins():
+    """Write buffered last_login timestamps before the worker exits"""
+    await last_login_recorder.stop()
+
+
+@app.on_event("startup")
+async def open_chat_http_client():
+    """Create the pooled provider client for this run of the app"""
+    app.state.chat_http = httpx.AsyncClient(timeout=30.0, limits=CHAT_HTTP_LIMITS)
+
+
+@app.on_event("shutdown")
+async def close_chat_http_client():
+    """Close pooled provider connections"""
+    await app.state.chat_http.aclose()
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    """Liveness probe; never touches the database"""
+    return Response(content=HEALTH_BODY, media_type="application/json")
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe; 503 until both databases answer SELECT 1"""
+    databases = await run_in_threadpool(ping_databases)
+    if not all(databases.values()):
+        return Response(
+            content=NOT_READY_BODY, status_code=503, media_type="application/json"
+        )
+    return Response(content=READY_BODY, media_type="application/json")
+
+
+@app.get("/health/detailed")
+async def detailed_health_check():
+    """Health check including database connectivity"""
+    # Blocking pooled SELECT 1, kept off the event loop
+    databases = await run_in_threadpool(ping_databases)
+    # Returned as a response so FastAPI skips jsonable_encoder
+    return ORJSONResponse(
+        {
+            **DETAILED_HEALTH_STATIC,
+            "status": "healthy" if all(databases.values()) else "degraded",
+            "timestamp": _now_iso(),
+            "databases": {
+                name: "connected" if ok else "unavailable"
+                for name, ok in databases.items()
+            },
+        }
+    )
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools ship with uvicorn[standard]; worker count follows
+    # WEB_CONCURRENCY, which needs the app passed as an import string
+    uvicorn.run(
+        "app.main:app", host="0.0.0.0", port=8000, loop="uvloop", http="httptools"
+    )
@@ -6,7 +6,6 @@ Built for MVP simplicity, designed for billion-dollar platform scale.
 import enum
 import uuid
 from datetime import datetime
-from typing import Any
 
 from sqlalchemy import (
     JSON,
@@ -21,11 +20,15 @@ from sqlalchemy import (
     String,
     Text,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import DeclarativeBase, relationship
 
-Base: Any = declarative_base()
+
+class Base(DeclarativeBase):
+    """Declarative base for all enterprise models"""
+
+    # Models use classic Column() attributes rather than Mapped[] annotations
+    __allow_unmapped__ = True
 
 
 # Enterprise Enums
@@ -176,6 +179,7 @@ class Tenant(Base, TimestampMixin):
         Index("ix_tenants_status", "status"),
         Index("ix_tenants_tier", "tier"),
         Index("ix_tenants_domain", "domain"),
+        Index("ix_tenants_name", "name"),
     )
 
     def to_dict(self):
@@ -325,8 +329,9 @@ class Agent(Base, TenantMixin, TimestampMixin):
     description = Column(Text)
     status: Column[AgentStatus] = Column(Enum(AgentStatus), default=AgentStatus.ACTIVE, nullable=False)  # type: ignore[assignment]
 
-    # Agent configuration (stored as JSON for flexibility)
-    config = Column(JSON, nullable=False)
+    # Agent configuration (stored as JSON for flexibility); jsonb on PostgreSQL
+    # so config merges and reads skip reparsing the text on every access
+    config = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
     model = Column(
         String(200), default="openrouter/meta-llama/llama-3.2-3b-instruct:free"
     )
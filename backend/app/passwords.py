@@ -0,0 +1,76 @@
+"""
+Password hashing for the AgentCores API.
+scrypt for new hashes; legacy PBKDF2-SHA256 hashes still verify.
+"""
+
+import hashlib
+import hmac
+import os
+
+# scrypt parameters for new hashes (16 MiB per hash, within OpenSSL's default
+# maxmem). Stored hashes carry their parameters so these can be raised later.
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+SCRYPT_PREFIX = "scrypt$"
+
+# Hashes created before scrypt are "salt:hash" PBKDF2-SHA256
+PBKDF2_ITERATIONS = 100000
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password with scrypt and a random salt"""
+    salt = os.urandom(32)
+    pwd_hash = hashlib.scrypt(
+        password.encode("utf-8"),
+        salt=salt,
+        n=SCRYPT_N,
+        r=SCRYPT_R,
+        p=SCRYPT_P,
+        dklen=SCRYPT_DKLEN,
+    )
+    return (
+        f"{SCRYPT_PREFIX}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$"
+        f"{salt.hex()}${pwd_hash.hex()}"
+    )
+
+
+# Verified against by app.main when an email is unknown, so that login takes as
+# long as it does for a wrong scrypt password and timing does not reveal
+# registered emails
+DUMMY_PASSWORD_HASH = get_password_hash(os.urandom(16).hex())
+
+
+def is_scrypt_hash(hashed_password: str) -> bool:
+    """True for hashes written by get_password_hash"""
+    return hashed_password.startswith(SCRYPT_PREFIX)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a scrypt or legacy PBKDF2 hash"""
+    try:
+        if is_scrypt_hash(hashed_password):
+            params = hashed_password[len(SCRYPT_PREFIX) :]
+            n, r, p, salt_hex, hash_hex = params.split("$")
+            expected_hash = bytes.fromhex(hash_hex)
+            computed_hash = hashlib.scrypt(
+                plain_password.encode("utf-8"),
+                salt=bytes.fromhex(salt_hex),
+                n=int(n),
+                r=int(r),
+                p=int(p),
+                dklen=len(expected_hash),
+            )
+        else:
+            salt_hex, hash_hex = hashed_password.split(":")
+            expected_hash = bytes.fromhex(hash_hex)
+            computed_hash = hashlib.pbkdf2_hmac(
+                "sha256",
+                plain_password.encode("utf-8"),
+                bytes.fromhex(salt_hex),
+                PBKDF2_ITERATIONS,
+            )
+        return hmac.compare_digest(computed_hash, expected_hash)
+    except Exception:
+        return False
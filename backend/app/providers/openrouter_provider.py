@@ -264,19 +264,12 @@ class OpenRouterProvider(AIProviderInterface):
                 "max_tokens": 10,
             }
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": self.site_url,
-                        "X-Title": self.site_name,
-                    },
-                    json=payload,
-                )
+            # Reuse the pooled client (auth headers included) with a short timeout
+            response: httpx.Response = await self.client.post(
+                f"{self.base_url}/chat/completions", json=payload, timeout=10.0
+            )
 
-                return response.status_code == 200
+            return response.status_code == 200
 
         except Exception as e:
             logger.error(f"OpenRouter health check failed: {str(e)}")
@@ -290,19 +283,11 @@ class OpenRouterProvider(AIProviderInterface):
         Future: Dynamic model discovery with capabilities
         """
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{self.base_url}/models",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "HTTP-Referer": self.site_url,
-                        "X-Title": self.site_name,
-                    },
-                )
+            response = await self.client.get(f"{self.base_url}/models", timeout=30.0)
 
-                if response.status_code == 200:
-                    models_data = response.json()
-                    return list(models_data.get("data", []))
+            if response.status_code == 200:
+                models_data = response.json()
+                return list(models_data.get("data", []))
 
         except Exception as e:
             logger.error(f"Failed to fetch models: {str(e)}")
@@ -438,13 +423,21 @@ class ProviderFactory:
     @staticmethod
     async def health_check_all() -> Dict[ProviderType, bool]:
         """Health check all providers for enterprise monitoring"""
-        results = {}
-        for provider_type in ProviderFactory.get_supported_providers():
+
+        async def check(provider_type: ProviderType) -> bool:
+            provider: Optional[AIProviderInterface] = None
             try:
                 provider = ProviderFactory.create_provider(provider_type)
-                results[provider_type] = await provider.health_check()
+                return await provider.health_check()
             except Exception as e:
                 logger.error(f"Health check failed for {provider_type}: {str(e)}")
-                results[provider_type] = False
-
-        return results
+                return False
+            finally:
+                # Each provider built here owns a pooled client; release it
+                if isinstance(provider, OpenRouterProvider):
+                    await provider.client.aclose()
+
+        # Probe providers concurrently instead of one after another
+        provider_types = ProviderFactory.get_supported_providers()
+        checks = await asyncio.gather(*(check(p) for p in provider_types))
+        return dict(zip(provider_types, checks))
@@ -0,0 +1,232 @@
+"""
+Request rate limiting for the AgentCores API.
+Sliding-window limiter shared across workers through Redis.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, List, Optional
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+
+    REDIS_AVAILABLE = True
+except ImportError:  # pragma: no cover - redis is a hard dependency in production
+    aioredis = None  # type: ignore[assignment]
+    RedisError = Exception  # type: ignore[assignment,misc]
+    REDIS_AVAILABLE = False
+
+# Sliding window over a sorted set: trim expired entries, count, and admit the
+# request only if it fits. Runs atomically on the Redis server in one round-trip.
+SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= limit then
+    return count + 1
+end
+redis.call('ZADD', key, now, now .. ':' .. ARGV[4])
+redis.call('PEXPIRE', key, window)
+return count + 1
+"""
+
+WINDOW_MS = 60_000
+REDIS_RETRY_SECONDS = 30.0
+MAX_LOCAL_KEYS = 100_000
+SWEEP_INTERVAL_SECONDS = 10.0
+SWEEP_BATCH_SIZE = 1024
+
+# Local windows use the monotonic clock so NTP steps cannot admit a burst
+_monotonic_ns = time.monotonic_ns
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing a per-client requests-per-minute limit.
+
+    Current: Redis sorted-set sliding window, in-process fallback when Redis is down
+    Future: Per-tenant quotas from the tenant tier
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 100,
+        redis_url: Optional[str] = None,
+        exempt_paths: Optional[List[str]] = None,
+        max_keys: int = MAX_LOCAL_KEYS,
+        trusted_proxies: int = 0,
+    ):
+        self.app = app
+        self.requests_per_minute = requests_per_minute
+        self.exempt_paths = set(exempt_paths or [])
+        self.trusted_proxies = trusted_proxies
+
+        self._redis: Any = None
+        self._script: Any = None
+        self._redis_retry_at = 0.0
+        self._sequence = 0
+        # Unique per worker so sorted-set members never collide across processes
+        self._member_prefix = secrets.token_hex(4)
+        if redis_url and REDIS_AVAILABLE:
+            self._redis = aioredis.from_url(redis_url)
+            self._script = self._redis.register_script(SLIDING_WINDOW_LUA)
+
+        # Fallback state used only while Redis is unreachable, kept in LRU
+        # order and capped so one-off client IPs cannot grow it without bound
+        self.client_requests: "OrderedDict[str, Deque[int]]" = OrderedDict()
+        self.max_keys = max_keys
+        self._sweeper_task: Optional[asyncio.Task[Any]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = self._client_key(scope)
+        count = await self._hit(key)
+        remaining = max(self.requests_per_minute - count, 0)
+
+        if count > self.requests_per_minute:
+            response = ORJSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={
+                    "Retry-After": str(WINDOW_MS // 1000),
+                    "X-RateLimit-Limit": str(self.requests_per_minute),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        limit_header = (b"x-ratelimit-limit", str(self.requests_per_minute).encode())
+        remaining_header = (b"x-ratelimit-remaining", str(remaining).encode())
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append(limit_header)
+                headers.append(remaining_header)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    def _client_key(self, scope: Scope) -> str:
+        """
+        Bucket key for the calling client. Only the resolved address is used:
+        request headers such as X-Tenant-ID are client-controlled, so keying on
+        them would hand out a fresh bucket per header value.
+        """
+        forwarded_for = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                forwarded_for = value.decode("latin-1")
+        return f"rl:{self._client_ip(scope, forwarded_for)}"
+
+    def _client_ip(self, scope: Scope, forwarded_for: Optional[str]) -> str:
+        """
+        Resolve the client address, honouring X-Forwarded-For only for the
+        configured number of trusted proxies. Each proxy appends the address
+        it received the request from, so the client is the entry just before
+        the trusted hops; anything further left is client-controlled.
+        """
+        if self.trusted_proxies and forwarded_for:
+            hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+            if hops:
+                return hops[max(len(hops) - self.trusted_proxies, 0)]
+
+        client = scope.get("client")
+        return str(client[0]) if client else "unknown"
+
+    async def _hit(self, key: str) -> int:
+        """Record a request and return the number of requests in the window"""
+        if self._script is not None and time.monotonic() >= self._redis_retry_at:
+            self._sequence += 1
+            try:
+                return int(
+                    await self._script(
+                        keys=[key],
+                        args=[
+                            # Wall clock: the window is shared across hosts
+                            time.time_ns() // 1_000_000,
+                            WINDOW_MS,
+                            self.requests_per_minute,
+                            f"{self._member_prefix}:{self._sequence}",
+                        ],
+                    )
+                )
+            except RedisError as e:
+                logger.warning(f"Rate limiter falling back to memory: {str(e)}")
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+
+        return self._hit_local(key)
+
+    def _hit_local(self, key: str) -> int:
+        """In-process sliding window used when Redis is not available"""
+        if self._sweeper_task is None:
+            self._start_sweeper()
+
+        current_time = _monotonic_ns() // 1_000_000
+        cutoff = current_time - WINDOW_MS
+        requests = self.client_requests.get(key)
+        if requests is None:
+            requests = deque(maxlen=self.requests_per_minute)
+            self.client_requests[key] = requests
+            while len(self.client_requests) > self.max_keys:
+                self.client_requests.popitem(last=False)
+        else:
+            self.client_requests.move_to_end(key)
+
+        # Timestamps are appended in order, so expired ones are at the left
+        while requests and requests[0] <= cutoff:
+            requests.popleft()
+
+        if len(requests) >= self.requests_per_minute:
+            return len(requests) + 1
+        requests.append(current_time)
+        return len(requests)
+
+    def _start_sweeper(self) -> None:
+        """Start the background sweep on the running event loop, if any"""
+        try:
+            self._sweeper_task = asyncio.get_running_loop().create_task(
+                self._sweep_loop()
+            )
+        except RuntimeError:
+            # Called outside an event loop; the LRU cap still bounds memory
+            pass
+
+    async def _sweep_loop(self) -> None:
+        """Periodically drop buckets whose newest request left the window"""
+        while True:
+            try:
+                await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+                await self._sweep_expired()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Rate limit sweep error: {str(e)}")
+
+    async def _sweep_expired(self) -> None:
+        """Remove expired buckets, yielding to the loop between batches"""
+        cutoff = _monotonic_ns() // 1_000_000 - WINDOW_MS
+        for index, key in enumerate(list(self.client_requests)):
+            requests = self.client_requests.get(key)
+            if requests is not None and (not requests or requests[-1] <= cutoff):
+                del self.client_requests[key]
+            if index % SWEEP_BATCH_SIZE == SWEEP_BATCH_SIZE - 1:
+                await asyncio.sleep(0)
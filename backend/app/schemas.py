@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class AgentStatus(str, Enum):
@@ -85,8 +85,7 @@ class Agent(AgentBase):
     last_active: Optional[datetime] = None
     created_by: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Task Schemas
@@ -121,8 +120,7 @@ class Task(TaskBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Task Execution Schemas
@@ -146,8 +144,7 @@ class TaskExecution(TaskExecutionBase):
     completed_at: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Chat Schemas
@@ -240,8 +237,7 @@ class UserResponse(UserBase):
     last_login: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserUpdate(BaseModel):
@@ -276,8 +272,7 @@ class TenantResponse(BaseModel):
     trial_end: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TenantUpdate(BaseModel):
@@ -297,8 +292,7 @@ class InvitationResponse(BaseModel):
     created_at: datetime
     invited_by: Optional[UserResponse] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Token Response - Defined after UserResponse and TenantResponse to avoid forward reference issues
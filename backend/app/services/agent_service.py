@@ -61,30 +61,80 @@ _TASK_STATUS_INTERFACE_TO_DB = {
     InterfaceTaskStatus.RETRYING: DBTaskStatus.PENDING,
 }
 
+# Task type/priority mappings between the API schema and the database
+_TASK_TYPE_SCHEMA_TO_DB = {
+    "completion": TaskType.COMPLETION,
+    "analysis": TaskType.ANALYSIS,
+    "workflow": TaskType.WORKFLOW,
+    "integration": TaskType.INTEGRATION,
+}
 
-class AgentService(AgentServiceInterface):
-    """Corrected Enterprise Agent Service"""
+_TASK_PRIORITY_SCHEMA_TO_DB = {
+    1: TaskPriority.LOW,
+    2: TaskPriority.NORMAL,
+    3: TaskPriority.NORMAL,
+    4: TaskPriority.HIGH,
+    5: TaskPriority.URGENT,
+}
 
-    def __init__(self, db: Session):
-        self.db = db
-        self.provider_registry = ProviderRegistry()
-        self.event_service = EventService()
-        self._initialize_providers()
+_TASK_PRIORITY_DB_TO_SCHEMA = {
+    TaskPriority.LOW: 1,
+    TaskPriority.NORMAL: 3,
+    TaskPriority.HIGH: 4,
+    TaskPriority.URGENT: 5,
+}
 
-    def _initialize_providers(self):
-        """Initialize AI providers"""
+
+# Process-wide provider registry and event bus, shared by every request's
+# AgentService instead of being rebuilt (and re-initialized) per request
+_provider_registry: Optional[ProviderRegistry] = None
+_event_service: Optional[EventService] = None
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Return the shared provider registry, initializing providers once"""
+    global _provider_registry
+    if _provider_registry is None:
+        registry = ProviderRegistry()
         try:
             from app.providers.openrouter_provider import OpenRouterProvider
 
-            self.provider_registry.register_provider(
-                ProviderType.OPENROUTER, OpenRouterProvider()
-            )
+            registry.register_provider(ProviderType.OPENROUTER, OpenRouterProvider())
         except Exception as e:
             logger.warning(f"Failed to initialize OpenRouter provider: {e}")
+        _provider_registry = registry
+    return _provider_registry
+
+
+def get_event_service() -> EventService:
+    """Return the shared event service"""
+    global _event_service
+    if _event_service is None:
+        _event_service = EventService()
+    return _event_service
+
+
+class AgentService(AgentServiceInterface):
+    """Corrected Enterprise Agent Service"""
+
+    def __init__(
+        self,
+        db: Session,
+        provider_registry: Optional[ProviderRegistry] = None,
+        event_service: Optional[EventService] = None,
+    ):
+        self.db = db
+        self.provider_registry = provider_registry or get_provider_registry()
+        self.event_service = event_service or get_event_service()
 
     # Interface implementation
     async def create_agent(self, config: AgentConfig, tenant_id: str) -> str:
         """Create agent with tenant isolation"""
+        db_agent = await self._create_db_agent(config, tenant_id)
+        return str(db_agent.agent_id)
+
+    async def _create_db_agent(self, config: AgentConfig, tenant_id: str) -> AgentModel:
+        """Insert the agent row and return the refreshed model"""
         try:
             # Get default user for tenant
             user = await self._get_default_user(tenant_id)
@@ -126,7 +176,7 @@ class AgentService(AgentServiceInterface):
             )
 
             logger.info(f"Agent {db_agent.agent_id} created for tenant {tenant_id}")
-            return str(db_agent.agent_id)
+            return db_agent
 
         except Exception as e:
             logger.error(f"Agent creation failed: {str(e)}")
@@ -294,11 +344,10 @@ class AgentService(AgentServiceInterface):
             sla_requirements={},
         )
 
-        agent_id = await self.create_agent(config, tenant_id)
-        agent = await self.get_agent(agent_id, tenant_id)
-        if not agent:
-            raise ValueError(f"Failed to retrieve created agent {agent_id}")
-        return agent
+        # The row was refreshed after insert, so convert it directly rather
+        # than querying it back by id
+        db_agent = await self._create_db_agent(config, tenant_id)
+        return self._db_agent_to_schema(db_agent)
 
     async def get_agent(self, agent_id: str, tenant_id: str) -> Optional[Agent]:
         """Get agent by ID within tenant"""
@@ -502,7 +551,8 @@ class AgentService(AgentServiceInterface):
         created_at = getattr(db_agent, "created_at", datetime.utcnow())
         updated_at = getattr(db_agent, "updated_at", datetime.utcnow())
 
-        return Agent(
+        # Rows come from our own database, so skip per-field validation
+        return Agent.model_construct(
             id=str(agent_id) if agent_id else "",
             name=getattr(db_agent, "name", ""),
             description=getattr(db_agent, "description", ""),
@@ -610,24 +660,11 @@ class TaskService:
         # Map task type and priority
         task_type = TaskType.COMPLETION
         if hasattr(task_data, "task_type"):
-            type_mapping = {
-                "completion": TaskType.COMPLETION,
-                "analysis": TaskType.ANALYSIS,
-                "workflow": TaskType.WORKFLOW,
-                "integration": TaskType.INTEGRATION,
-            }
-            task_type = type_mapping.get(
+            task_type = _TASK_TYPE_SCHEMA_TO_DB.get(
                 task_data.task_type.lower(), TaskType.COMPLETION
             )
 
-        priority_mapping = {
-            1: TaskPriority.LOW,
-            2: TaskPriority.NORMAL,
-            3: TaskPriority.NORMAL,
-            4: TaskPriority.HIGH,
-            5: TaskPriority.URGENT,
-        }
-        priority = priority_mapping.get(
+        priority = _TASK_PRIORITY_SCHEMA_TO_DB.get(
             getattr(task_data, "priority", 3), TaskPriority.NORMAL
         )
 
@@ -798,7 +835,8 @@ class TaskService:
         task_type = getattr(db_task, "task_type", TaskType.COMPLETION)
         priority = getattr(db_task, "priority", TaskPriority.NORMAL)
 
-        return Task(
+        # Rows come from our own database, so skip per-field validation
+        return Task.model_construct(
             id=str(task_id) if task_id else "",
             agent_id=str(agent_id) if agent_id else "",
             name=input_data.get("name", f"Task {task_id}") if task_id else "Task",
@@ -810,12 +848,7 @@ class TaskService:
             ),
             input_data=input_data.get("data", {}),
             output_schema=None,
-            priority={
-                TaskPriority.LOW: 1,
-                TaskPriority.NORMAL: 3,
-                TaskPriority.HIGH: 4,
-                TaskPriority.URGENT: 5,
-            }.get(priority, 3),
+            priority=_TASK_PRIORITY_DB_TO_SCHEMA.get(priority, 3),
             timeout_seconds=getattr(db_task, "timeout_seconds", 300) or 300,
             retry_count=getattr(db_task, "max_retries", 3) or 3,
             created_at=getattr(db_task, "created_at", datetime.utcnow()),
@@ -10,10 +10,13 @@ import uuid
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of queued events the processor drains per wakeup
+EVENT_BATCH_SIZE = 256
+
 
 class EventType(Enum):
     """Standard event types for enterprise observability"""
@@ -180,6 +183,7 @@ class EventStore:
         self._events: Dict[str, Event] = {}
         self._events_by_type: Dict[EventType, List[str]] = {}
         self._events_by_tenant: Dict[str, List[str]] = {}
+        self._events_by_tenant_type: Dict[Tuple[str, EventType], List[str]] = {}
 
         self.max_events = max_events
         self.retention_hours = retention_hours
@@ -202,6 +206,12 @@ class EventStore:
                 self._events_by_tenant[event.tenant_id] = []
             self._events_by_tenant[event.tenant_id].append(event.event_id)
 
+            # Composite index so tenant + type queries skip other tenants
+            key = (event.tenant_id, event.event_type)
+            if key not in self._events_by_tenant_type:
+                self._events_by_tenant_type[key] = []
+            self._events_by_tenant_type[key].append(event.event_id)
+
         # Trigger cleanup if needed
         if len(self._events) > self.max_events:
             await self._cleanup_old_events()
@@ -210,33 +220,53 @@ class EventStore:
         """Retrieve event by ID"""
         return self._events.get(event_id)
 
+    def _latest(
+        self, event_ids: Iterable[str], limit: int, since: Optional[datetime]
+    ) -> List[Event]:
+        """Walk ids newest first, stopping at the limit or the time window"""
+        events: List[Event] = []
+        for event_id in event_ids:
+            if len(events) >= limit:
+                break
+            event = self._events.get(event_id)
+            if event is None:
+                continue
+            # Ids are stored in publish order, so everything after is older
+            if since and event.timestamp < since:
+                break
+            events.append(event)
+        return events
+
     async def get_events_by_type(
         self, event_type: EventType, limit: int = 100, since: Optional[datetime] = None
     ) -> List[Event]:
         """Get events by type with filtering"""
         event_ids = self._events_by_type.get(event_type, [])
-        events = []
-
-        for event_id in reversed(event_ids[-limit:]):  # Latest first
-            event = self._events.get(event_id)
-            if event and (not since or event.timestamp >= since):
-                events.append(event)
-
-        return events
+        return self._latest(reversed(event_ids), limit, since)
 
     async def get_events_by_tenant(
         self, tenant_id: str, limit: int = 100, since: Optional[datetime] = None
     ) -> List[Event]:
         """Get events by tenant with filtering"""
         event_ids = self._events_by_tenant.get(tenant_id, [])
-        events = []
+        return self._latest(reversed(event_ids), limit, since)
 
-        for event_id in reversed(event_ids[-limit:]):  # Latest first
-            event = self._events.get(event_id)
-            if event and (not since or event.timestamp >= since):
-                events.append(event)
+    async def get_events_by_tenant_and_type(
+        self,
+        tenant_id: str,
+        event_type: EventType,
+        limit: int = 100,
+        since: Optional[datetime] = None,
+    ) -> List[Event]:
+        """Get events for one tenant and type with filtering"""
+        event_ids = self._events_by_tenant_type.get((tenant_id, event_type), [])
+        return self._latest(reversed(event_ids), limit, since)
 
-        return events
+    async def get_recent_events(
+        self, limit: int = 100, since: Optional[datetime] = None
+    ) -> List[Event]:
+        """Get latest events across all types and tenants"""
+        return self._latest(reversed(self._events), limit, since)
 
     async def get_event_stats(self) -> Dict[str, Any]:
         """Get event store statistics"""
@@ -294,6 +324,13 @@ class EventStore:
                     except ValueError:
                         pass
 
+                key = (event.tenant_id, event.event_type)
+                if key in self._events_by_tenant_type:
+                    try:
+                        self._events_by_tenant_type[key].remove(event_id)
+                    except ValueError:
+                        pass
+
         if events_to_remove:
             logger.info(f"Cleaned up {len(events_to_remove)} old events")
 
@@ -355,6 +392,9 @@ class EventService:
                 await self._processor_task
             except asyncio.CancelledError:
                 pass
+            # Cleared so a later publish_event starts a fresh processor rather
+            # than queueing behind the finished one
+            self._processor_task = None
 
         if self.event_store and hasattr(self.event_store, "_cleanup_task"):
             self.event_store._cleanup_task.cancel()
@@ -374,6 +414,11 @@ class EventService:
         Current: Simple event publishing
         Future: Event validation, schema enforcement, routing
         """
+        # Start draining on first use so a never-started service cannot
+        # accumulate events indefinitely
+        if self._processor_task is None:
+            await self.start()
+
         try:
             # Determine event type
             if event_type is None:
@@ -393,8 +438,8 @@ class EventService:
                 correlation_id=correlation_id or str(uuid.uuid4()),
             )
 
-            # Add to processing queue
-            await self._event_queue.put(event)
+            # Add to processing queue (unbounded, so this never blocks)
+            self._event_queue.put_nowait(event)
 
             self._metrics["events_published"] += 1
 
@@ -457,20 +502,18 @@ class EventService:
         if not self.event_store:
             return []
 
-        if event_type:
+        # Filters are resolved through the store's indexes rather than by
+        # scanning and sorting every stored event
+        if event_type and tenant_id:
+            return await self.event_store.get_events_by_tenant_and_type(
+                tenant_id, event_type, limit, since
+            )
+        elif event_type:
             return await self.event_store.get_events_by_type(event_type, limit, since)
         elif tenant_id:
             return await self.event_store.get_events_by_tenant(tenant_id, limit, since)
         else:
-            # Return recent events across all types (limited implementation)
-            all_events = []
-            for event in self.event_store._events.values():
-                if not since or event.timestamp >= since:
-                    all_events.append(event)
-
-            # Sort by timestamp and limit
-            all_events.sort(key=lambda e: e.timestamp, reverse=True)
-            return all_events[:limit]
+            return await self.event_store.get_recent_events(limit, since)
 
     async def get_service_stats(self) -> Dict[str, Any]:
         """Get service statistics for monitoring"""
@@ -511,9 +554,26 @@ class EventService:
 
         while self._running:
             try:
-                # Get next event with timeout
-                event = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
+                # Block until an event arrives (stop() cancels this task), then
+                # drain whatever else is already queued in the same wakeup
+                batch = [await self._event_queue.get()]
+                while len(batch) < EVENT_BATCH_SIZE and not self._event_queue.empty():
+                    batch.append(self._event_queue.get_nowait())
+
+                await self._process_event_batch(batch)
 
+            except asyncio.CancelledError:
+                logger.info("Event processor cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Event processor error: {str(e)}")
+
+        logger.info("Event processor stopped")
+
+    async def _process_event_batch(self, batch: List[Event]) -> None:
+        """Store and dispatch a batch of events"""
+        for event in batch:
+            try:
                 # Store event if store is enabled
                 if self.event_store:
                     await self.event_store.store_event(event)
@@ -523,18 +583,10 @@ class EventService:
 
                 self._metrics["events_processed"] += 1
 
-            except asyncio.TimeoutError:
-                # No events to process, continue
-                continue
-            except asyncio.CancelledError:
-                logger.info("Event processor cancelled")
-                break
             except Exception as e:
                 logger.error(f"Event processor error: {str(e)}")
                 self._metrics["events_failed"] += 1
 
-        logger.info("Event processor stopped")
-
     async def _process_event_with_handlers(self, event: Event) -> None:
         """Process event with all matching handlers"""
         matching_handlers = []
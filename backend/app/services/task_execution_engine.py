@@ -133,6 +133,11 @@ class TaskQueue:
         self._running_tasks: Dict[str, TaskExecution] = {}
         self._completed_tasks: Dict[str, TaskExecution] = {}
 
+        # Wakes idle workers on enqueue instead of having them poll
+        self._not_empty = asyncio.Event()
+        # Resolved with the TaskResult when a task completes
+        self._result_futures: Dict[str, asyncio.Future] = {}
+
     async def enqueue(self, task_definition: TaskDefinition):
         """Add task to appropriate priority queue"""
         task_execution = TaskExecution(
@@ -142,7 +147,12 @@ class TaskQueue:
         )
 
         self._pending_tasks[task_definition.task_id] = task_execution
+        if task_definition.task_id not in self._result_futures:
+            self._result_futures[
+                task_definition.task_id
+            ] = asyncio.get_running_loop().create_future()
         await self._queues[task_definition.priority].put(task_execution)
+        self._not_empty.set()
 
         logger.info(
             f"Task enqueued: {task_definition.task_id} (priority: {task_definition.priority.value})"
@@ -159,7 +169,7 @@ class TaskQueue:
         ]:
             queue = self._queues[priority]
             if not queue.empty():
-                task_execution: TaskExecution = await queue.get()
+                task_execution: TaskExecution = queue.get_nowait()
 
                 # Move from pending to running
                 if task_execution.task_id in self._pending_tasks:
@@ -171,8 +181,13 @@ class TaskQueue:
 
                 return task_execution
 
+        self._not_empty.clear()
         return None
 
+    async def wait_for_tasks(self) -> None:
+        """Block until a task is enqueued"""
+        await self._not_empty.wait()
+
     def complete_task(self, task_id: str, result: TaskResult):
         """Mark task as completed"""
         if task_id in self._running_tasks:
@@ -189,6 +204,22 @@ class TaskQueue:
 
             self._completed_tasks[task_id] = task_execution
 
+            future = self._result_futures.pop(task_id, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    async def wait_for_result(self, task_id: str) -> Optional[TaskResult]:
+        """Wait until the task completes and return its result"""
+        task_execution = self._completed_tasks.get(task_id)
+        if task_execution is not None:
+            return task_execution.result
+
+        future = self._result_futures.get(task_id)
+        if future is None:
+            return None
+        # Shield so one caller timing out does not cancel the shared future
+        return await asyncio.shield(future)
+
     def get_task_status(self, task_id: str) -> Optional[TaskExecution]:
         """Get current task status"""
         for task_dict in [
@@ -334,6 +365,15 @@ class TaskExecutionEngine:
         task_execution = self.task_queue.get_task_status(task_id)
         return task_execution.result if task_execution else None
 
+    async def await_result(self, task_id: str) -> Optional[TaskResult]:
+        """
+        Wait for task completion without polling.
+
+        Callers bound the wait themselves, e.g.
+        ``await asyncio.wait_for(engine.await_result(task_id), timeout=30)``
+        """
+        return await self.task_queue.wait_for_result(task_id)
+
     async def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """Get current task status"""
         task_execution = self.task_queue.get_task_status(task_id)
@@ -404,8 +444,8 @@ class TaskExecutionEngine:
                 # Get next task
                 task_execution = await self.task_queue.dequeue()
                 if not task_execution:
-                    # No tasks available, wait briefly
-                    await asyncio.sleep(0.1)
+                    # No tasks available, sleep until one is enqueued
+                    await self.task_queue.wait_for_tasks()
                     continue
 
                 # Execute task
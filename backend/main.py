@@ -1,8 +1,9 @@
 from datetime import datetime
 
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.agents import router as agents_router
 from app.api.auth import router as auth_router
@@ -22,6 +23,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -34,24 +36,8 @@ app.add_middleware(
 )
 
 
-# Simplified middleware for single-domain architecture
-@app.middleware("http")
-async def tenant_middleware(request: Request, call_next):
-    """Single-domain tenant context middleware"""
-    # Skip middleware for health checks and docs
-    if request.url.path in [
-        "/",
-        "/docs",
-        "/redoc",
-        "/openapi.json",
-    ] or request.url.path.startswith("/api/v1/health"):
-        response = await call_next(request)
-        return response
-
-    # For single-domain architecture, tenant context is managed through authentication
-    # No subdomain extraction needed - tenant context comes from JWT token
-    response = await call_next(request)
-    return response
+# Single-domain architecture: tenant context comes from the JWT token via the
+# auth dependencies, so no per-request tenant middleware is installed.
 
 
 # Include routers
@@ -79,4 +65,11 @@ async def api_health_check():
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        loop="uvloop",
+        http="httptools",
+    )
@@ -47,6 +47,17 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def auth_headers():
+    """Bearer token header accepted by the app.main auth dependency"""
+    from app.main import create_access_token
+
+    token = create_access_token(
+        {"sub": "test-user", "email": "test@example.com", "tenant_id": "test-tenant"}
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
 @pytest.fixture
 def db():
     """Database fixture"""
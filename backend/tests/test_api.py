@@ -104,17 +104,34 @@ class TestInputValidation:
         )
         assert response.status_code == 422
 
-    def test_agent_creation_validation(self, client):
+    def test_agent_creation_validation(self, client, auth_headers):
         """Test agent creation input validation"""
-        # Empty data - should fail validation
+        # Authentication is checked before the body is validated
         response = client.post("/agents", json={})
+        assert response.status_code == 401
+
+        # Empty data - should fail validation
+        response = client.post("/agents", json={}, headers=auth_headers)
         assert response.status_code == 422  # Validation error
 
         # Invalid data types (validation error)
         invalid_data = {"name": 123, "description": True}
-        response = client.post("/agents", json=invalid_data)
+        response = client.post("/agents", json=invalid_data, headers=auth_headers)
         assert response.status_code == 422  # Validation error
 
+    def test_agent_creation_keeps_auth_errors(self, client):
+        """Test that auth failures inside create_agent stay 401, not 500"""
+        from app.main import create_access_token
+
+        # Signed, but without the email claim create_agent requires
+        token = create_access_token({"sub": "test-user", "tenant_id": "test-tenant"})
+        response = client.post(
+            "/agents",
+            json={"name": "Agent", "description": "Test agent"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 401
+
 
 class TestEndpointOptions:
     """Test OPTIONS method on various endpoints"""
@@ -265,7 +282,7 @@ class TestAuthEndpointValidation:
 class TestAgentEndpointValidation:
     """Test agent endpoint validation comprehensively"""
 
-    def test_agent_creation_with_invalid_data_types(self, client):
+    def test_agent_creation_with_invalid_data_types(self, client, auth_headers):
         """Test agent creation with various invalid data types"""
         invalid_data_sets = [
             {"name": 123, "description": "valid"},  # name should be string
@@ -276,7 +293,7 @@ class TestAgentEndpointValidation:
         ]
 
         for invalid_data in invalid_data_sets:
-            response = client.post("/agents", json=invalid_data)
+            response = client.post("/agents", json=invalid_data, headers=auth_headers)
             assert response.status_code == 422  # Validation error
 
     def test_agent_endpoints_http_methods(self, client):
@@ -0,0 +1,71 @@
+"""
+Tests for the active-user cache
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.auth_cache import (  # noqa: E402
+    ACTIVE_USER_RECHECK_SECONDS,
+    REDIS_TIMEOUT_SECONDS,
+    ActiveUserCache,
+    RedisError,
+)
+
+
+@pytest.mark.asyncio
+async def test_local_layer_serves_users_without_redis():
+    cache = ActiveUserCache(ttl_seconds=60)
+
+    assert await cache.get("tenant-1", "user-1") is None
+    await cache.set("tenant-1", "user-1", "individual")
+    assert await cache.get("tenant-1", "user-1") == "individual"
+
+    await cache.discard("tenant-1", "user-1")
+    assert await cache.get("tenant-1", "user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_fills_local_layer():
+    cache = ActiveUserCache(ttl_seconds=60)
+    cache._redis = AsyncMock()
+    cache._redis.get.return_value = b"org"
+
+    assert await cache.get("tenant-1", "user-1") == "org"
+    assert await cache.get("tenant-1", "user-1") == "org"
+    cache._redis.get.assert_awaited_once_with("auth:tenant-1:user-1")
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_memory():
+    cache = ActiveUserCache(ttl_seconds=60)
+    cache._redis = AsyncMock()
+    cache._redis.set.side_effect = RedisError("connection refused")
+
+    await cache.set("tenant-1", "user-1", "org")
+
+    assert await cache.get("tenant-1", "user-1") == "org"
+    cache._redis.get.assert_not_awaited()
+
+
+def test_redis_client_fails_fast():
+    with patch("app.auth_cache.aioredis.from_url") as from_url:
+        ActiveUserCache(ttl_seconds=60, redis_url="redis://cache:6379/0")
+
+    kwargs = from_url.call_args.kwargs
+    assert kwargs["socket_timeout"] == REDIS_TIMEOUT_SECONDS
+    assert kwargs["socket_connect_timeout"] == REDIS_TIMEOUT_SECONDS
+
+
+def test_api_rechecks_active_users_well_before_tokens_expire():
+    from app.main import ACCESS_TOKEN_EXPIRE_MINUTES, active_users
+
+    assert active_users.ttl_seconds == ACTIVE_USER_RECHECK_SECONDS
+    assert active_users._local.ttl == ACTIVE_USER_RECHECK_SECONDS
+    assert ACTIVE_USER_RECHECK_SECONDS < ACCESS_TOKEN_EXPIRE_MINUTES * 60
@@ -0,0 +1,53 @@
+"""
+Tests for deferred last_login updates
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.last_login import LastLoginRecorder  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_latest_login_per_user_in_one_batch():
+    session = MagicMock()
+    recorder = LastLoginRecorder({"org": lambda: session})
+    first = datetime(2024, 1, 1)
+    later = first + timedelta(minutes=5)
+
+    recorder.record("org", "user-1", first)
+    recorder.record("org", "user-1", later)
+    recorder.record("org", "user-2", first)
+
+    assert await recorder.flush() == 2
+    rows = session.execute.call_args.args[1]
+    assert {row["id"]: row["last_login"] for row in rows} == {
+        "user-1": later,
+        "user-2": first,
+    }
+    session.commit.assert_called_once()
+    session.close.assert_called_once()
+    await recorder.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_logins_for_next_attempt():
+    session = MagicMock()
+    session.execute.side_effect = RuntimeError("database unavailable")
+    recorder = LastLoginRecorder({"org": lambda: session})
+
+    recorder.record("org", "user-1", datetime(2024, 1, 1))
+
+    assert await recorder.flush() == 0
+    session.rollback.assert_called_once()
+
+    session.execute.side_effect = None
+    assert await recorder.flush() == 1
+    await recorder.stop()
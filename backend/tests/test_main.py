@@ -98,6 +98,28 @@ class TestMainAppRoutes:
         valid_statuses = ["healthy", "ok", "up", "running", "ready"]
         assert any(status in data["status"].lower() for status in valid_statuses)
 
+    def test_readiness_route_reports_ready(self, client):
+        """Test readiness probe when both databases answer"""
+        with patch(
+            "app.main.ping_databases",
+            return_value={"org": True, "individual": True},
+        ):
+            response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ready"}
+
+    def test_readiness_route_returns_503_when_database_down(self, client):
+        """Test readiness probe when a database is unavailable"""
+        with patch(
+            "app.main.ping_databases",
+            return_value={"org": True, "individual": False},
+        ):
+            response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json() == {"status": "not_ready"}
+
     def test_route_discovery(self, app):
         """Test route discovery and enumeration"""
         routes = []
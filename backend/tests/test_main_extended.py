@@ -50,6 +50,213 @@ def test_token_utilities():
     assert token != token2
 
 
+def test_decode_token_reuses_cached_payload():
+    """Test that verified tokens are decoded once and expire with their claim"""
+    from datetime import timedelta
+
+    from jwt.exceptions import ExpiredSignatureError
+
+    from app.main import create_access_token, decode_token, token_cache
+
+    token = create_access_token({"sub": "123"}, timedelta(minutes=5))
+    payload = decode_token(token)
+
+    assert payload["sub"] == "123"
+    assert token_cache[token] is payload
+    assert decode_token(token) is payload
+
+    # A cached entry past its exp claim is rejected and evicted
+    token_cache[token] = {**payload, "exp": 0}
+    with pytest.raises(ExpiredSignatureError):
+        decode_token(token)
+    assert token not in token_cache
+
+
+def test_get_agents_serves_cached_tenant_list(client):
+    """Test that a cached agent list is returned without querying the databases"""
+    from app.main import agents_cache, create_access_token
+
+    token = create_access_token({"sub": "123", "tenant_id": "tenant-cache"})
+    body = b'{"tenant_id":"tenant-cache","agents":[],"total":0}'
+    agents_cache["tenant-cache"] = body
+    try:
+        with patch("app.main._first_agent_batch") as encode:
+            response = client.get(
+                "/agents", headers={"Authorization": f"Bearer {token}"}
+            )
+        assert response.status_code == 200
+        assert response.content == body
+        encode.assert_not_called()
+    finally:
+        agents_cache.pop("tenant-cache", None)
+
+
+def test_get_agents_streams_batches_and_caches_small_lists(client):
+    """Test that agents are streamed batch by batch and small lists cached"""
+    from datetime import datetime
+
+    from app.database import get_individual_db, get_org_db
+    from app.main import agents_cache, app, create_access_token
+
+    created = datetime(2024, 1, 1)
+    db = Mock()
+    db.execute.return_value.partitions.return_value = iter(
+        [
+            [("a1", "One", "", "idle", {}, created, None)],
+            [("a2", "Two", "", "idle", {}, created, None)],
+        ]
+    )
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_org_db] = lambda: db
+    app.dependency_overrides[get_individual_db] = lambda: db
+    token = create_access_token(
+        {"sub": "123", "tenant_id": "tenant-stream", "acct": "org"}
+    )
+    try:
+        response = client.get("/agents", headers={"Authorization": f"Bearer {token}"})
+        body = response.json()
+        assert [agent["agent_id"] for agent in body["agents"]] == ["a1", "a2"]
+        assert body["total"] == 2
+        assert agents_cache["tenant-stream"] == response.content
+
+        # Bodies over the cap are streamed but not cached
+        agents_cache.pop("tenant-stream", None)
+        db.execute.return_value.partitions.return_value = iter(
+            [[("a1", "One", "", "idle", {}, created, None)]]
+        )
+        with patch("app.main.AGENT_CACHE_MAX_BYTES", 10):
+            response = client.get(
+                "/agents", headers={"Authorization": f"Bearer {token}"}
+            )
+        assert response.json()["total"] == 1
+        assert "tenant-stream" not in agents_cache
+    finally:
+        app.dependency_overrides = overrides
+        agents_cache.pop("tenant-stream", None)
+
+
+def test_get_agents_database_errors_are_not_partial_lists():
+    """Test that a failing database never yields a complete-looking agent list"""
+    from datetime import datetime
+
+    from app.database import get_individual_db, get_org_db
+    from app.main import agents_cache, app, create_access_token
+
+    def failing_batches():
+        yield [("a1", "One", "", "idle", {}, datetime(2024, 1, 1), None)]
+        raise RuntimeError("connection lost")
+
+    db = Mock()
+    db.execute.side_effect = RuntimeError("database down")
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_org_db] = lambda: db
+    app.dependency_overrides[get_individual_db] = lambda: db
+    token = create_access_token({"sub": "123", "tenant_id": "tenant-down"})
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app, raise_server_exceptions=False)
+    try:
+        # Failing before the first batch is a plain 500
+        response = client.get("/agents", headers=headers)
+        assert response.status_code == 500
+
+        # Failing mid-cursor aborts the body instead of closing the document
+        db.execute.side_effect = None
+        db.execute.return_value.partitions.side_effect = failing_batches
+        response = client.get("/agents", headers=headers)
+        assert response.status_code != 200 or not response.content.endswith(b"}")
+        with pytest.raises(ValueError):
+            json.loads(response.content)
+        assert "tenant-down" not in agents_cache
+    finally:
+        app.dependency_overrides = overrides
+        agents_cache.pop("tenant-down", None)
+
+
+def test_chat_http_client_opened_per_app_run():
+    """Test that restarting the app gives chat a fresh, open provider client"""
+    from app.main import app
+
+    with TestClient(app):
+        first = app.state.chat_http
+    assert first.is_closed
+
+    with TestClient(app):
+        assert app.state.chat_http is not first
+        assert not app.state.chat_http.is_closed
+
+
+def test_update_missing_agent_returns_404(client):
+    """Test that update_agent's own 404 is not turned into a 500"""
+    from app.database import get_individual_db, get_org_db
+    from app.main import app, create_access_token
+
+    db = Mock()
+    db.execute.return_value.fetchone.return_value = None
+    overrides = dict(app.dependency_overrides)
+    app.dependency_overrides[get_org_db] = lambda: db
+    app.dependency_overrides[get_individual_db] = lambda: db
+    token = create_access_token({"sub": "123", "tenant_id": "tenant-update"})
+    try:
+        response = client.put(
+            "/agents/missing",
+            json={"name": "Renamed"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+    finally:
+        app.dependency_overrides = overrides
+    assert response.status_code == 404
+    db.commit.assert_not_called()
+
+
+def test_tenant_sessions_use_known_home_database():
+    """Test that agent lookups only query the tenant's database once it is known"""
+    from app.main import _tenant_sessions, tenant_databases
+
+    org_db, individual_db = Mock(), Mock()
+    payload = {"tenant_id": "tenant-route"}
+    assert _tenant_sessions(payload, org_db, individual_db) == (
+        ("org", org_db),
+        ("individual", individual_db),
+    )
+
+    # The token's acct claim routes without the table
+    assert _tenant_sessions({**payload, "acct": "org"}, org_db, individual_db) == (
+        ("org", org_db),
+    )
+
+    tenant_databases["tenant-route"] = "individual"
+    try:
+        assert _tenant_sessions(payload, org_db, individual_db) == (
+            ("individual", individual_db),
+        )
+    finally:
+        tenant_databases.pop("tenant-route", None)
+
+
+def test_chat_settings_cached_per_config_text():
+    """Test that chat settings are built once per stored config"""
+    from app.main import _chat_settings, chat_settings_cache
+
+    config_text = json.dumps(
+        {
+            "model": "google/gemma-7b-it:free",
+            "instructions": "Be brief.",
+            "temperature": 5,
+            "response_style": "concise",
+        }
+    )
+    try:
+        settings = _chat_settings(config_text)
+        # Legacy models map to their replacement, without the openrouter/ prefix
+        assert settings["api_model"] == "google/gemma-3-12b-it:free"
+        assert settings["temperature"] == 2.0
+        assert settings["system_prompt"].startswith("Be brief. SECURITY:")
+        assert "Keep responses brief" in settings["system_prompt"]
+        assert _chat_settings(config_text) is settings
+    finally:
+        chat_settings_cache.pop(config_text, None)
+
+
 def test_database_utilities():
     """Test database utility functions"""
     # Test get_appropriate_db function logic
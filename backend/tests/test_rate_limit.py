@@ -0,0 +1,109 @@
+"""
+Tests for the request rate limiting middleware
+"""
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.rate_limit import RateLimitMiddleware  # noqa: E402
+
+
+def _make_client(requests_per_minute: int = 3) -> TestClient:
+    test_app = FastAPI()
+
+    @test_app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @test_app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    test_app.add_middleware(
+        RateLimitMiddleware,
+        requests_per_minute=requests_per_minute,
+        exempt_paths=["/health"],
+    )
+    return TestClient(test_app)
+
+
+class TestRateLimitMiddleware:
+    """Test the in-process sliding window used without Redis"""
+
+    def test_requests_under_limit_pass_with_headers(self):
+        client = _make_client(requests_per_minute=3)
+
+        response = client.get("/ping")
+
+        assert response.status_code == 200
+        assert response.headers["x-ratelimit-limit"] == "3"
+        assert response.headers["x-ratelimit-remaining"] == "2"
+
+    def test_requests_over_limit_are_rejected(self):
+        client = _make_client(requests_per_minute=2)
+
+        assert client.get("/ping").status_code == 200
+        assert client.get("/ping").status_code == 200
+        response = client.get("/ping")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "60"
+        assert response.headers["x-ratelimit-remaining"] == "0"
+
+    def test_exempt_paths_are_not_counted(self):
+        client = _make_client(requests_per_minute=1)
+
+        for _ in range(5):
+            assert client.get("/health").status_code == 200
+        assert client.get("/ping").status_code == 200
+
+    def test_tenant_header_does_not_open_new_bucket(self):
+        client = _make_client(requests_per_minute=1)
+
+        assert client.get("/ping", headers={"X-Tenant-ID": "a"}).status_code == 200
+        assert client.get("/ping", headers={"X-Tenant-ID": "b"}).status_code == 429
+
+
+def test_hit_local_counts_within_window():
+    middleware = RateLimitMiddleware(app=None, requests_per_minute=2)
+
+    assert middleware._hit_local("k") == 1
+    assert middleware._hit_local("k") == 2
+    assert middleware._hit_local("k") == 3
+    assert middleware._hit_local("other") == 1
+
+
+def test_hit_local_evicts_least_recently_used_keys():
+    middleware = RateLimitMiddleware(app=None, requests_per_minute=5, max_keys=2)
+
+    middleware._hit_local("a")
+    middleware._hit_local("b")
+    middleware._hit_local("a")
+    middleware._hit_local("c")
+
+    assert list(middleware.client_requests) == ["a", "c"]
+
+
+class TestRateLimitClientKey:
+    """Test client resolution behind reverse proxies"""
+
+    scope = {
+        "client": ("10.0.0.1", 1234),
+        "headers": [(b"x-forwarded-for", b"1.1.1.1, 203.0.113.7, 10.0.0.2")],
+    }
+
+    def test_forwarded_for_ignored_without_trusted_proxies(self):
+        middleware = RateLimitMiddleware(app=None)
+
+        assert middleware._client_key(self.scope) == "rl:10.0.0.1"
+
+    def test_forwarded_for_uses_hop_before_trusted_proxies(self):
+        middleware = RateLimitMiddleware(app=None, trusted_proxies=2)
+
+        assert middleware._client_key(self.scope) == "rl:203.0.113.7"
@@ -330,6 +330,21 @@ class TestEventService:
         except Exception as e:
             pytest.skip(f"EventService initialization test skipped: {e}")
 
+    @pytest.mark.asyncio
+    async def test_publish_after_stop_restarts_processing(self):
+        """Test that events published after stop are still drained"""
+        from app.services.event_service import EventService
+
+        service = EventService(enable_store=False)
+        await service.start()
+        await service.stop()
+        assert service._processor_task is None
+
+        await service.publish_event({"type": "custom"})
+        assert service._running
+        assert not service._processor_task.done()
+        await service.stop()
+
     def test_event_types_enum(self):
         """Test EventType enum"""
         try:
@@ -342,6 +357,45 @@ class TestEventService:
         except ImportError:
             pytest.skip("EventType enum test skipped")
 
+    async def test_event_store_tenant_and_type_index(self):
+        """Test combined tenant and type lookups return only matching events"""
+        from datetime import datetime, timedelta
+
+        from app.services.event_service import Event, EventStore, EventType
+
+        store = EventStore()
+        try:
+            now = datetime.utcnow()
+            for index, (tenant_id, event_type) in enumerate(
+                [
+                    ("tenant-a", EventType.AGENT_CREATED),
+                    ("tenant-b", EventType.AGENT_CREATED),
+                    ("tenant-a", EventType.TASK_FAILED),
+                    ("tenant-a", EventType.AGENT_CREATED),
+                ]
+            ):
+                await store.store_event(
+                    Event(
+                        event_id=f"event-{index}",
+                        event_type=event_type,
+                        timestamp=now + timedelta(seconds=index),
+                        data={},
+                        tenant_id=tenant_id,
+                    )
+                )
+
+            events = await store.get_events_by_tenant_and_type(
+                "tenant-a", EventType.AGENT_CREATED
+            )
+            recent = await store.get_recent_events(
+                limit=10, since=now + timedelta(seconds=2)
+            )
+
+            assert [e.event_id for e in events] == ["event-3", "event-0"]
+            assert [e.event_id for e in recent] == ["event-3", "event-2"]
+        finally:
+            store._cleanup_task.cancel()
+
 
 class TestTaskExecutionEngine:
     """Test TaskExecutionEngine functionality"""
@@ -367,6 +421,35 @@ class TestTaskExecutionEngine:
         except ImportError:
             pytest.skip("TaskExecutionEngine methods test skipped")
 
+    async def test_task_execution_engine_await_result(self):
+        """Test that submitted tasks resolve await_result without polling"""
+        import asyncio
+
+        from app.core.interfaces import AgentConfig
+        from app.services.task_execution_engine import (
+            TaskExecutionEngine,
+            TaskStatus,
+            create_completion_task,
+        )
+
+        engine = TaskExecutionEngine(max_concurrent_tasks=1)
+        await engine.start()
+        try:
+            config = AgentConfig(
+                name="Test", description="Test", model="test", system_prompt="Test"
+            )
+            task_id = await engine.submit_task(
+                create_completion_task("Hello", config, tenant_id="tenant-1")
+            )
+
+            result = await asyncio.wait_for(engine.await_result(task_id), timeout=5)
+
+            assert result is not None
+            assert result.status == TaskStatus.COMPLETED
+            assert await engine.await_result(task_id) is result
+        finally:
+            await engine.stop()
+
 
 class TestTemplateEngine:
     """Test TemplateEngine functionality"""